@@ -0,0 +1 @@
+"""Throughput benchmarks of schema inference and casting."""
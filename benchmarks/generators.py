@@ -0,0 +1,139 @@
+"""Seeded generators of synthetic tables of string literals for benchmarks.
+
+Notes
+-----
+* Each table kind is a list of column generators; a column generator takes a
+  `random.Random` instance and returns one literal.  Literals are padded with
+  whitespace now and then, as found in real files.
+* Tables are sized by their number of cells, so that tall and wide tables of
+  the same size cost roughly the same to generate and cast.
+"""
+
+from datetime import date, datetime, timedelta
+import random
+import string
+
+
+SIZES = {
+    "small": 20000,
+    "medium": 400000,
+    "large": 4000000,
+}
+
+_WORDS = ["foo", "bar", "baz", "qux", "quux", "corge", "grault", "garply"]
+
+_START = datetime(2000, 1, 1)
+
+
+def missing(rng):
+    return rng.choice(["", "", "NULL", "NaN", "None", "null"])
+
+
+def integer(rng):
+    return str(rng.randint(-10 ** 6, 10 ** 6))
+
+
+def float_(rng):
+    return f"{rng.uniform(-1e4, 1e4):.{rng.randint(1, 4)}f}"
+
+
+def number(rng):
+    return rng.choice([integer, float_])(rng)
+
+
+def boolean(rng):
+    return rng.choice(["true", "false", "TRUE", "FALSE", "True", "False"])
+
+
+def date_(rng):
+    day = date(2000, 1, 1) + timedelta(days=rng.randrange(10000))
+    return day.strftime(rng.choice(["%Y-%m-%d", "%m/%d/%Y"]))
+
+
+def time_(rng):
+    moment = _START + timedelta(seconds=rng.randrange(86400))
+    return moment.strftime(rng.choice(["%H:%M:%S", "%H:%M", "%I:%M %p"]))
+
+
+def datetime_(rng):
+    moment = _START + timedelta(seconds=rng.randrange(10 ** 9))
+    return moment.strftime(
+        rng.choice(["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%SZ"])
+    )
+
+
+def percent(rng):
+    return f"{rng.uniform(-100, 100):.1f}%"
+
+
+def currency(rng):
+    return rng.choice(["${:,.2f}", "-${:,.2f}", "(${:,.0f})"]).format(
+        rng.uniform(0, 1e6)
+    )
+
+
+def string_(rng):
+    if rng.random() < 0.5:
+        return rng.choice(_WORDS)
+    return "".join(rng.choices(string.ascii_letters, k=rng.randint(3, 12)))
+
+
+def sometimes(generator, other, rate):
+    """Return a column generator that calls `other` at the given rate and
+    `generator` otherwise.
+    """
+
+    def _generate(rng):
+        return (other if rng.random() < rate else generator)(rng)
+
+    return _generate
+
+
+def padded(generator, rate=0.05):
+    """Return a column generator that pads literals with whitespace at the
+    given rate.
+    """
+
+    def _generate(rng):
+        literal = generator(rng)
+        return f" {literal} " if rng.random() < rate else literal
+
+    return _generate
+
+
+ALL_TYPES = [
+    integer, float_, number, boolean, date_, time_, datetime_, percent,
+    currency, string_,
+]
+
+KINDS = {
+    "tall": [padded(generator) for generator in ALL_TYPES],
+    "wide": [padded(generator) for generator in ALL_TYPES * 20],
+    "missing-heavy": [
+        padded(sometimes(generator, missing, 0.8)) for generator in ALL_TYPES
+    ],
+    "mixed": [
+        sometimes(integer, string_, 0.1),
+        sometimes(float_, boolean, 0.3),
+        sometimes(date_, datetime_, 0.5),
+        sometimes(currency, percent, 0.5),
+        sometimes(string_, number, 0.4),
+    ],
+    "date-heavy": [padded(date_), padded(time_), padded(datetime_)] * 3,
+    "currency-percent": [padded(currency), padded(percent)] * 4,
+}
+
+
+def make_table(kind, cells, seed=0):
+    """Return a table of about the given number of cells for the table kind,
+    generated with the given seed.
+    """
+    columns = KINDS[kind]
+    rng = random.Random(seed)
+    num_rows = max(cells // len(columns), 1)
+    return {
+        "header": [f"col{i}" for i in range(len(columns))],
+        "rows": [
+            [generate(rng) for generate in columns] for _ in range(num_rows)
+        ],
+    }
@@ -0,0 +1,192 @@
+"""Run the throughput benchmarks of schema inference and casting.
+
+Usage
+-----
+    python -m benchmarks.run [--size small] [--kinds tall wide ...]
+                             [--parallel] [--repeat 3] [--no-memory]
+                             [--save NAME] [--compare NAME] [--tolerance 0.1]
+
+Notes
+-----
+* Each table kind (see `generators.KINDS`) is generated with a fixed seed and
+  timed for `infer_schema` and `cast`, taking the best of `--repeat` runs.
+  With `--parallel`, the same operations also run with `parallel=True` and
+  the speedup over the serial path is reported.
+* Peak memory is measured with `tracemalloc` in a separate run, since tracing
+  slows the computation down.
+* `--save NAME` stores the results in `benchmarks/baselines/NAME.json`;
+  `--compare NAME` reports the ratio to a stored baseline and exits with
+  status 1 if any operation is slower by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import generators as gn
+from infermary import table
+
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def _best_time(func, repeat):
+    """Return the best wall-clock time of `repeat` calls of the function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func):
+    """Return the peak memory (in MiB) allocated by a call of the function.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def _operations(tbl, schema, parallel):
+    """Return the dict of named benchmark operations for the table."""
+    operations = {
+        "infer": lambda: table.infer_schema(tbl),
+        "cast": lambda: table.cast(tbl, schema),
+    }
+    if parallel:
+        operations["infer-parallel"] = lambda: table.infer_schema(
+            tbl, parallel=True
+        )
+        operations["cast-parallel"] = lambda: table.cast(
+            tbl, schema, parallel=True
+        )
+    return operations
+
+
+def run(kinds, cells, parallel=False, repeat=3, memory=True):
+    """Return the benchmark results keyed by "kind/operation"."""
+    results = {}
+    for kind in kinds:
+        tbl = gn.make_table(kind, cells)
+        num_cells = len(tbl["rows"]) * len(tbl["header"])
+        schema = table.infer_schema(tbl)
+        for name, func in _operations(tbl, schema, parallel).items():
+            seconds = _best_time(func, repeat)
+            result = {
+                "cells": num_cells,
+                "seconds": seconds,
+                "cells_per_sec": num_cells / seconds,
+            }
+            if memory:
+                result["peak_mib"] = _peak_memory(func)
+            results[f"{kind}/{name}"] = result
+        for name in ("infer", "cast"):
+            if f"{kind}/{name}-parallel" in results:
+                results[f"{kind}/{name}-parallel"]["speedup"] = (
+                    results[f"{kind}/{name}"]["seconds"]
+                    / results[f"{kind}/{name}-parallel"]["seconds"]
+                )
+    return results
+
+
+def _commit():
+    """Return the current git commit of the repository, or None."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _report(results, baseline=None):
+    """Print a table of the results, with ratios to the baseline results."""
+    print(
+        f"{'benchmark':<32}{'cells/s':>12}{'seconds':>10}{'peak MiB':>10}"
+        f"{'speedup':>9}{'vs base':>9}"
+    )
+    for key, result in results.items():
+        peak = result.get("peak_mib")
+        speedup = result.get("speedup")
+        ratio = None
+        if baseline and key in baseline:
+            ratio = result["cells_per_sec"] / baseline[key]["cells_per_sec"]
+        print(
+            f"{key:<32}{result['cells_per_sec']:>12,.0f}"
+            f"{result['seconds']:>10.3f}"
+            f"{'' if peak is None else f'{peak:.1f}':>10}"
+            f"{'' if speedup is None else f'{speedup:.2f}x':>9}"
+            f"{'' if ratio is None else f'{ratio:.2f}x':>9}"
+        )
+
+
+def _regressions(results, baseline, tolerance):
+    """Return the keys of the results slower than the baseline by more than
+    the tolerance.
+    """
+    return [
+        key for key, result in results.items()
+        if key in baseline and result["cells_per_sec"]
+        < (1 - tolerance) * baseline[key]["cells_per_sec"]
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", choices=gn.SIZES, default="small")
+    parser.add_argument("--kinds", nargs="+", choices=gn.KINDS,
+                        default=list(gn.KINDS))
+    parser.add_argument("--parallel", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--save", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINES, f"{args.compare}.json")) as fobj:
+            baseline = json.load(fobj)["results"]
+    results = run(
+        args.kinds,
+        gn.SIZES[args.size],
+        args.parallel,
+        args.repeat,
+        not args.no_memory,
+    )
+    _report(results, baseline)
+    if args.save:
+        os.makedirs(BASELINES, exist_ok=True)
+        meta = {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": args.size,
+        }
+        path = os.path.join(BASELINES, f"{args.save}.json")
+        with open(path, "w") as fobj:
+            json.dump({"meta": meta, "results": results}, fobj, indent=2)
+            fobj.write("\n")
+    if baseline is not None:
+        slower = _regressions(results, baseline, args.tolerance)
+        if slower:
+            print(f"Regressions beyond {args.tolerance:.0%}: "
+                  f"{', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,11 @@
 """Error handling wrapper.
-"""
 
-from decorator import decorator
+Notes
+-----
+* The `decorator` package is imported when a first function is wrapped, and
+  `with_error_getattr` defers the wrapping of the `*_with_error` variants of
+  a module to their first access.
+"""
 
 
 def _expand_error(exc):
@@ -13,10 +17,9 @@ def _expand_error(exc):
     }
 
 
-@decorator
-def error_catcher(func, *args):
-    """Decorator to catch exceptions and return a payload with `error` and
-    `result` fields.
+def _catch_errors(func, *args):
+    """Return a payload with `error` and `result` fields for the call of
+    the function.
     """
     try:
         return {"errors": [], "result": func(*args)}
@@ -25,3 +28,29 @@ def error_catcher(func, *args):
             "errors": [_expand_error(exc)],
             "result": None
         }
+
+
+def error_catcher(func):
+    """Decorator to catch exceptions and return a payload with `error` and
+    `result` fields.
+    """
+    from decorator import decorate  # pylint: disable=import-outside-toplevel
+
+    return decorate(func, _catch_errors)
+
+
+def with_error_getattr(namespace, variants):
+    """Return a module `__getattr__` function that wraps, on first access,
+    the functions of the module namespace named by the `variants` dict of
+    variant name to function name.
+    """
+
+    def __getattr__(name):
+        if name not in variants:
+            raise AttributeError(
+                f"module {namespace['__name__']!r} has no attribute {name!r}"
+            )
+        namespace[name] = error_catcher(namespace[variants[name]])
+        return namespace[name]
+
+    return __getattr__
@@ -0,0 +1,207 @@
+"""Module exposing opt-in instrumentation of the inference and casting hot
+paths.
+
+Notes
+-----
+* Instrumentation is off by default and then costs nothing per literal: the
+  casters of the type registry are only replaced by timing wrappers while a
+  `Recorder` is enabled, and the table-level code checks `ACTIVE` once per
+  call.
+* An enabled recorder counts, per type, the caster attempts, successes, and
+  failures and their cumulative time (including the temporal format matching
+  of table casting), the non-empty literals sampled per column, the time
+  spent creating worker pools vs. mapping work over them, and the time and
+  size of each table cast.
+* Work done in worker processes is not recorded, since each process holds
+  its own copy of the recorder; threads record into the shared recorder.
+* Hooks are callables `hook(event, data)` called with the coarse events
+  "sample", "pool", and "cast" (never for single caster attempts).
+
+Examples
+--------
+>>> with recording() as recorder:
+...     schema = table.infer_schema(tbl)
+>>> print(recorder.report())
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+
+
+# The enabled recorder, or None.
+ACTIVE = None
+
+
+class Recorder:
+    """Collector of hot-path counters and timings, with event hooks."""
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.attempts = Counter()
+        self.successes = Counter()
+        self.failures = Counter()
+        self.caster_time = Counter()
+        self.sampled = []
+        self.pool_setup = 0.0
+        self.pool_work = 0.0
+        self.casts = []
+
+    def add_hook(self, hook):
+        """Register a callable `hook(event, data)`."""
+        self.hooks.append(hook)
+
+    def emit(self, event, **data):
+        """Call the hooks with the event name and data."""
+        for hook in self.hooks:
+            hook(event, data)
+
+    def _record_attempt(self, type_, seconds, success):
+        self.attempts[type_] += 1
+        self.caster_time[type_] += seconds
+        if success:
+            self.successes[type_] += 1
+        else:
+            self.failures[type_] += 1
+
+    def timed_caster(self, type_, caster, failed):
+        """Return the caster wrapped to record its attempts, where a result
+        that is `failed` counts as a failure.
+        """
+
+        def _timed(literal):
+            start = perf_counter()
+            value = caster(literal)
+            self._record_attempt(
+                type_, perf_counter() - start, value is not failed
+            )
+            return value
+
+        return _timed
+
+    def timed_find(self, type_, find):
+        """Return the format plan `find` method wrapped to record its
+        attempts against the given temporal type.
+        """
+
+        def _timed(literal, pinned=None):
+            start = perf_counter()
+            found = find(literal, pinned)
+            self._record_attempt(
+                type_, perf_counter() - start, found is not None
+            )
+            return found
+
+        return _timed
+
+    def record_sample(self, header, samples):
+        """Record the number of literals sampled for each column."""
+        sampled = [
+            {"name": name, "cells": len(sample)}
+            for name, sample in zip(header, samples)
+        ]
+        self.sampled.extend(sampled)
+        self.emit("sample", columns=sampled)
+
+    def record_pool(self, setup, work):
+        """Record the seconds spent creating a pool and mapping over it."""
+        self.pool_setup += setup
+        self.pool_work += work
+        self.emit("pool", setup=setup, work=work)
+
+    def record_cast(self, seconds, rows, columns):
+        """Record the seconds spent casting a table of the given size."""
+        cast = {"seconds": seconds, "rows": rows, "columns": columns}
+        self.casts.append(cast)
+        self.emit("cast", **cast)
+
+    def summary(self):
+        """Return a dict with all the recorded counters and timings."""
+        return {
+            "types": {
+                type_: {
+                    "attempts": self.attempts[type_],
+                    "successes": self.successes[type_],
+                    "failures": self.failures[type_],
+                    "seconds": self.caster_time[type_],
+                }
+                for type_ in self.attempts
+            },
+            "sampled": list(self.sampled),
+            "pool": {"setup": self.pool_setup, "work": self.pool_work},
+            "casts": list(self.casts),
+        }
+
+    def report(self):
+        """Return a human-readable report of the recorded counters."""
+        lines = [
+            f"{'type':<10}{'attempts':>10}{'success':>10}{'failure':>10}"
+            f"{'seconds':>10}{'us/attempt':>12}"
+        ]
+        for type_, count in self.attempts.most_common():
+            seconds = self.caster_time[type_]
+            lines.append(
+                f"{type_:<10}{count:>10}{self.successes[type_]:>10}"
+                f"{self.failures[type_]:>10}{seconds:>10.4f}"
+                f"{1e6 * seconds / count:>12.2f}"
+            )
+        cells = sum(column["cells"] for column in self.sampled)
+        lines.append(
+            f"sampled: {cells} literals in {len(self.sampled)} columns"
+        )
+        lines.append(
+            f"pools: {self.pool_setup:.4f}s setup, {self.pool_work:.4f}s work"
+        )
+        rows = sum(cast["rows"] for cast in self.casts)
+        seconds = sum(cast["seconds"] for cast in self.casts)
+        lines.append(f"casts: {len(self.casts)} tables, {rows} rows, "
+                     f"{seconds:.4f}s")
+        return "\n".join(lines)
+
+
+_ORIGINAL_CASTERS = None
+
+
+def enable(hooks=()):
+    """Enable and return a new `Recorder`.  A RuntimeError is raised if a
+    recorder is already enabled.
+    """
+    # pylint: disable=global-statement,import-outside-toplevel
+    global ACTIVE, _ORIGINAL_CASTERS
+    from infermary.literals import types as tp
+
+    if ACTIVE is not None:
+        raise RuntimeError("Instrumentation is already enabled.")
+    recorder = Recorder(hooks)
+    _ORIGINAL_CASTERS = dict(tp.TYPE_TO_TRY_CASTER)
+    for type_, caster in _ORIGINAL_CASTERS.items():
+        tp.TYPE_TO_TRY_CASTER[type_] = recorder.timed_caster(
+            type_, caster, tp.casters.FAILED
+        )
+    ACTIVE = recorder
+    return recorder
+
+
+def disable():
+    """Disable and return the enabled recorder, restoring the original
+    casters.  Return None if no recorder is enabled.
+    """
+    # pylint: disable=global-statement,import-outside-toplevel
+    global ACTIVE, _ORIGINAL_CASTERS
+    from infermary.literals import types as tp
+
+    recorder = ACTIVE
+    if recorder is not None:
+        tp.TYPE_TO_TRY_CASTER.update(_ORIGINAL_CASTERS)
+        ACTIVE = _ORIGINAL_CASTERS = None
+    return recorder
+
+
+@contextmanager
+def recording(hooks=()):
+    """Context manager that enables a `Recorder` until exit."""
+    recorder = enable(hooks)
+    try:
+        yield recorder
+    finally:
+        disable()
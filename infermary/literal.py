@@ -24,6 +24,21 @@ def cast(literal, type_):
     return lt.cast(literal, type_)
 
 
+def try_cast(literal, type_):
+    """Return the value object for the given string literal and type, or the
+    `FAILED` sentinel if the literal cannot be cast against the given type.
+    Unlike `cast`, failures raise no exception.
+
+    Examples
+    --------
+    >>> try_cast("1", "integer")
+    1
+    >>> try_cast("1", "datetime") is FAILED
+    True
+    """
+    return lt.try_cast(literal, type_)
+
+
 def infer_type(literal, inferred_types=None):
     """Return the inferred type of the given string literal for the given list
     of types.  If inferred types are not provided, a default list is used.
@@ -41,5 +56,18 @@ def infer_type(literal, inferred_types=None):
     return lt.infer_type(literal, ordered_inferred_types)
 
 
-cast_with_error = ec.error_catcher(cast)
-infer_type_with_error = ec.error_catcher(infer_type)
+def warmup():
+    """Precompile the format matchers of the temporal types, and import the
+    `strptime` machinery, which are otherwise built on the first temporal
+    cast.  Call it once at startup (e.g. in a serverless function's init) to
+    keep the latency of the first calls low.
+    """
+    lt.warmup()
+
+
+FAILED = lt.FAILED
+
+__getattr__ = ec.with_error_getattr(globals(), {
+    "cast_with_error": "cast",
+    "infer_type_with_error": "infer_type",
+})
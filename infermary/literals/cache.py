@@ -0,0 +1,134 @@
+"""Module holding a size-bounded memo cache for literal type inference and
+casting.
+
+Notes
+-----
+* Entries are evicted in least-recently-used order once `maxsize` is reached.
+* Failed casts are cached as well; a cached failure raises a fresh
+  `CastError`.
+* Non-string literals bypass the cache so that they raise the same
+  `InvalidLiteralError` as the uncached functions.
+* A cache handed to a parallel computation is copied into each worker, so
+  the counters of the caller's instance only reflect serial use.
+* A cache may be shared by the threads of the "threads" backend: lookups and
+  updates hold a lock, but values are computed outside of it, so a literal
+  may occasionally be computed twice.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from infermary.exceptions import CastError
+from infermary.literals import literal as lt
+
+DEFAULT_MAXSIZE = 10000
+
+
+class LiteralCache:
+    """Size-bounded LRU cache of `infer_type` and `cast` results with hit,
+    miss, and eviction counters.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("The cache size must be a positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def memoize(self, key, func, *args):
+        """Return the cached value for the key, or compute it with
+        `func(*args)` and store it.
+        """
+        data = self._data
+        with self._lock:
+            try:
+                value = data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                data.move_to_end(key)
+                self.hits += 1
+                return value
+        value = func(*args)
+        with self._lock:
+            data[key] = value
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def infer_type(self, literal, inferred_types):
+        """Return the inferred type of the literal for the ordered list of
+        types, see `literals.literal.infer_type`.
+        """
+        if not isinstance(literal, str):
+            return lt.infer_type(literal, inferred_types)
+        return self.memoize(
+            ("infer", literal, tuple(inferred_types)),
+            lt.infer_type, literal, inferred_types
+        )
+
+    def try_cast(self, literal, type_):
+        """Return the value object for the literal and type, or `FAILED`, see
+        `literals.literal.try_cast`.
+        """
+        if not isinstance(literal, str):
+            return lt.try_cast(literal, type_)
+        return self.memoize(
+            ("cast", literal, type_), lt.try_cast, literal, type_
+        )
+
+    def cast(self, literal, type_):
+        """Return the value object for the literal and type, see
+        `literals.literal.cast`.
+        """
+        value = self.try_cast(literal, type_)
+        if value is lt.FAILED:
+            raise CastError(
+                f"The input '{literal}' cannot be cast to a value of type "
+                f"'{type_}'."
+            )
+        return value
+
+    def stats(self):
+        """Return a dict with the cache counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+def resolve_cache(cache):
+    """Return the cache to use for a single call: None if caching is off, a
+    new call-scoped cache if `cache` is True, or the caller-held cache.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return LiteralCache()
+    return cache
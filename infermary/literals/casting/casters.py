@@ -1,90 +1,179 @@
 """Library of functions that attempt to cast string values to instances of
-objects with the indicated type.  All casting functions raise a TypeError if
-the cast fails.
+objects with the indicated type.  The `try_*` casting functions return the
+`FAILED` sentinel if the cast fails; the other casting functions raise a
+TypeError instead.
 """
 
+from datetime import datetime
+
 from infermary.literals.casting import formats as fmt
 from infermary.literals.casting import helpers as hp
 
+FAILED = hp.FAILED
+
+
+def try_missing(literal):
+    """Cast the literal as None if it matches one of the specified missing
+    sentinel values.
+    """
+    return None if literal in fmt.MISSING else FAILED
+
+
+def try_percent(literal):
+    """Cast the literal to a number if the literal has a percent sign.
+    """
+    return hp.try_percent(literal, fmt.PERCENT)
+
+
+def try_currency(literal):
+    """Cast the literal to a number if the literal has a dollar sign.
+    """
+    return hp.try_currency(literal, fmt.CURRENCY)
+
+
+def try_datetime(literal):
+    """Cast the literal to a datetime.datetime object if it matches one of the
+    specified datetime.datetime string patterns.
+    """
+    return hp.try_datetime(literal, fmt.DATETIME)
+
+
+def try_date(literal):
+    """Cast the literal to a datetime.date object if it matches one of the
+    specified datetime.date string patterns.
+    """
+    value = hp.try_datetime(literal, fmt.DATE)
+    return FAILED if value is FAILED else value.date()
+
+
+def try_time(literal):
+    """Cast the literal to a datetime.time object if it matches one of the
+    specified datetime.time string patterns."""
+    value = hp.try_datetime(literal, fmt.TIME)
+    return FAILED if value is FAILED else value.time()
+
+
+def try_number(literal):
+    """Cast the literal to a float if it is converted successfully by the
+    `try_number` helper.
+    """
+    return hp.try_number(literal)
+
+
+def try_integer(literal):
+    """Cast the literal to an integer if it is converted successfully by the
+    `try_integer` helper.
+    """
+    return hp.try_integer(literal)
+
+
+def try_float(literal):
+    """Cast the literal to a float if it is converted successfully by the
+    `try_float` helper.
+    """
+    return hp.try_float(literal)
+
+
+def try_boolean(literal):
+    """Cast the literal to True (False) if it matches one of the True (False)
+    sentinel values.
+    """
+    if literal in fmt.TRUE:
+        return True
+    elif literal in fmt.FALSE:
+        return False
+    return FAILED
+
+
+def try_string(literal):
+    """Cast the literal to a string, or None if it is a missing sentinel
+    value.
+    """
+    return None if literal in fmt.MISSING else literal
+
+
+def try_datelike(literal):
+    """Cast the literal to a datetime.date object if it matches the string
+    pattern of a datetime.date or datetime.datetime.
+
+    WARNING: This casting is lossy if the input is a datetime.
+    """
+    value = hp.try_datetime(literal, fmt.DATELIKE)
+    return FAILED if value is FAILED else value.date()
+
 
 def missing_(literal):
     """Cast the literal as None if it matches one of the specified missing
     sentinel values.
     """
-    if literal in fmt.MISSING:
-        return None
-    raise TypeError
+    return hp.checked(try_missing(literal))
 
 
 def percent_(literal):
     """Cast the literal to a number if the literal has a percent sign.
     """
-    return hp.handle_percent(literal, fmt.PERCENT)
+    return hp.checked(try_percent(literal))
 
 
 def currency_(literal):
     """Cast the literal to a number if the literal has a dollar sign.
     """
-    return hp.handle_currency(literal, fmt.CURRENCY)
+    return hp.checked(try_currency(literal))
 
 
 def datetime_(literal):
     """Cast the literal to a datetime.datetime object if it matches one of the
     specified datetime.datetime string patterns.
     """
-    return hp.handle_datetime(literal, fmt.DATETIME)
+    return hp.checked(try_datetime(literal))
 
 
 def date_(literal):
     """Cast the literal to a datetime.date object if it matches one of the
     specified datetime.date string patterns.
     """
-    return hp.handle_datetime(literal, fmt.DATE).date()
+    return hp.checked(try_date(literal))
 
 
 def time_(literal):
     """Cast the literal to a datetime.time object if it matches one of the
     specified datetime.time string patterns."""
-    return hp.handle_datetime(literal, fmt.TIME).time()
+    return hp.checked(try_time(literal))
 
 
 def number_(literal):
     """Cast the literal to a float if it is converted successfully by the
     `to_number` function.
     """
-    return hp.handle_numeric(literal, hp.to_number)
+    return hp.checked(try_number(literal))
 
 
 def integer_(literal):
     """Cast the literal to an integer if it is converted successfully by the
     `to_integer` function.
     """
-    return hp.handle_numeric(literal, hp.to_integer)
+    return hp.checked(try_integer(literal))
 
 
 def float_(literal):
     """Cast the literal to a float if it is converted successfully by the
     `to_float` function.
     """
-    return hp.handle_numeric(literal, hp.to_float)
+    return hp.checked(try_float(literal))
 
 
 def boolean_(literal):
     """Cast the literal to True (False) if it matches one of the True (False)
     sentinel values.
     """
-    if literal in fmt.TRUE:
-        return True
-    elif literal in fmt.FALSE:
-        return False
-    raise TypeError
+    return hp.checked(try_boolean(literal))
 
 
 def string_(literal):
     """Cast the literal to a string if it is converted successfully by the `str`
     function.
     """
-    return None if literal in fmt.MISSING else literal
+    return try_string(literal)
 
 
 def datelike_(literal):
@@ -93,4 +182,18 @@ def datelike_(literal):
 
     WARNING: This casting is lossy if the input is a datetime.
     """
-    return hp.handle_datetime(literal, fmt.DATELIKE).date()
+    return hp.checked(try_datelike(literal))
+
+
+def _identity(value):
+    return value
+
+
+# Format lists and datetime conversions of the temporal casters, for callers
+# that parse many literals against the same plan.
+TEMPORAL = {
+    "datetime": (fmt.DATETIME, _identity),
+    "date": (fmt.DATE, datetime.date),
+    "time": (fmt.TIME, datetime.time),
+    "datelike": (fmt.DATELIKE, datetime.date),
+}
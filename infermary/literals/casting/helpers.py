@@ -1,10 +1,21 @@
 """Library of helper functions for literal casting.
+
+Notes
+-----
+* The `try_*` helpers return the `FAILED` sentinel when the literal cannot be
+  converted, so that failed attempts (the common case during inference)
+  allocate no exceptions.  The raising helpers wrap them.
+* The numeric helpers (including those of percents and currencies) share
+  `scan_number`, which converts a literal with a single `float` call and
+  remembers the last literal scanned.  Integers are then converted exactly
+  from the scanned text.
 """
 
-from datetime import datetime
-from math import fabs
+from math import fabs, inf
 import re
 
+from infermary.literals.casting import temporal as tm
+
 
 NUMBER_WITH_COMMAS_PATTERN = re.compile(r"^-?(?!0)\d{1,3}(,\d{3})+(\.\d+)?$")
 
@@ -16,6 +27,29 @@ MULTIPLIERS = {
 }
 
 
+class _Failed:
+    """Marker of a failed cast, which stays a singleton when pickled into
+    worker processes.
+    """
+
+    def __repr__(self):
+        return "FAILED"
+
+    def __reduce__(self):
+        return "FAILED"
+
+
+FAILED = _Failed()
+
+
+def checked(value):
+    """Return the value, or raise a TypeError if it is the `FAILED` sentinel.
+    """
+    if value is FAILED:
+        raise TypeError
+    return value
+
+
 def _strip_numeric_commas(literal):
     """If the literal matches the pattern of a number with commas, return the
     string with the commas removed; otherwise, return the literal.
@@ -36,115 +70,172 @@ def _strip_numeric_commas(literal):
     return literal.replace(",", "")
 
 
-def _has_nonnumeric_leading_zero(literal):
-    """Return True if the literal has a leading zero that is inconsistent with
-    a numeric pattern.
+_LAST_SCAN = (None, FAILED)
+
+
+def _scan(literal):
+    """Return the tuple (value, text) of the literal, see `scan_number`."""
+    # The whole part (before any ".") of a number may only start with "0"
+    # if it is "0".
+    if literal[:1] == "0" and literal[1:2] not in ("", "."):
+        return FAILED
+    try:
+        return float(literal), literal
+    except ValueError:
+        pass
+    if "," not in literal:
+        return FAILED
+    text = _strip_numeric_commas(literal)
+    try:
+        return float(text), text
+    except ValueError:
+        return FAILED
+
+
+def scan_number(literal):
+    """Return the tuple (value, text) of the float value of a numeric literal
+    and the text it was converted from (without grouping commas), or
+    `FAILED` if the literal is not a number.  The numeric casters share the
+    scan: the last one is remembered, since inference attempts several
+    numeric types in a row on the same literal.
 
     Examples
     --------
-    >>> has_nonnumeric_leading_zero("0")
-    False
-    >>> has_nonnumeric_leading_zero("01")
-    True
-    >>> has_nonnumeric_leading_zero("0.1")
-    False
-    >>> has_nonnumeric_leading_zero("01.1")
-    True
+    >>> scan_number("1,234")
+    (1234.0, "1234")
+    >>> scan_number("01")
+    FAILED
     """
-    whole_part = literal.split(".")[0]
-    return len(whole_part) > 1 and whole_part.startswith("0")
+    global _LAST_SCAN  # pylint: disable=global-statement
+    last = _LAST_SCAN
+    if last[0] == literal:
+        return last[1]
+    scan = _scan(literal)
+    _LAST_SCAN = (literal, scan)
+    return scan
 
 
-def to_number(literal):
+def try_number(literal):
     """Return a floating point number if the literal matches the pattern of a
-    number and float conversion is successful.
+    number and float conversion is successful; otherwise, return `FAILED`.
 
     Examples
     --------
-    >>> to_number("1.0")
+    >>> try_number("1.0")
     1.0
-    >>> to_number("1,234.5")
+    >>> try_number("1,234.5")
     1234.5
-    >>> to_number("1e-1")
+    >>> try_number("1e-1")
     0.1
-    >>> to_number("-1.1e1")
+    >>> try_number("-1.1e1")
     -11.0
-    >>> to_number("1,23,4.5")  # Error
+    >>> try_number("1,23,4.5")
+    FAILED
     """
-    if not _has_nonnumeric_leading_zero(literal):
-        return float(_strip_numeric_commas(literal))
-    raise TypeError
+    scan = scan_number(literal)
+    return FAILED if scan is FAILED else scan[0]
 
 
-def to_float(literal):
+def try_float(literal):
     """Return a floating point number if float conversion is successful and
     1) the string has exactly one decimal point.
     or (inclusive)
     2) the string as exactly one "e" (or "E") and the cast float is in (0, 1).
+    Otherwise, return `FAILED`.
 
     Examples
     --------
-    >>> to_float("1.0")
+    >>> try_float("1.0")
     1.0
-    >>> to_float(".0")
+    >>> try_float(".0")
     0.0
-    >>> to_float("1e-1")
+    >>> try_float("1e-1")
     0.1
-    >>> to_float("1.e-1")
+    >>> try_float("1.e-1")
     0.1
-    >>> to_float("1")   # Error
-    >>> to_float("1e0")   # Error
-    >>> to_float("1e-0")  # Error
+    >>> try_float("1")
+    FAILED
+    >>> try_float("1e0")
+    FAILED
     """
-    value = to_number(literal)
+    scan = scan_number(literal)
+    if scan is FAILED:
+        return FAILED
+    value = scan[0]
     has_one_dot = (literal.count(".") == 1)
     exp_in_01 = (
         (literal.lower().count("e") == 1) and
         (0 < fabs(value) < 1))
     if has_one_dot or exp_in_01:
         return value
-    raise TypeError
+    return FAILED
 
 
-def to_integer(literal):
+def try_integer(literal):
     """Return an integer if float conversion is successful and
     1) the string has no decimal point
     and
     2) the float conversion numerically equals the integer conversion
+    Otherwise, return `FAILED`.  Plain integer literals (without an
+    exponent) are converted exactly, beyond the precision of floats.
 
     Examples
     --------
-    >>> to_integer("1")
+    >>> try_integer("1")
     1
-    >>> to_integer("1e1")
+    >>> try_integer("1e1")
     10
-    >>> to_integer("1e-0")
+    >>> try_integer("1e-0")
     1
-    >>> to_integer("1.0")  # Error
-    >>> to_integer("0.0")  # Error
-    >>> to_integer("1.e-0")  # Error
+    >>> try_integer("12345678901234567891")
+    12345678901234567891
+    >>> try_integer("1.0")
+    FAILED
+    >>> try_integer("inf")
+    FAILED
     """
-    float_value = to_number(literal)
+    scan = scan_number(literal)
+    if scan is FAILED or "." in literal:
+        return FAILED
+    float_value, text = scan
+    if float_value in (inf, -inf) or float_value != float_value:
+        return FAILED
+    try:
+        # Exact for integer texts, while "1e1" or "1.0" raise.
+        return int(text)
+    except ValueError:
+        pass
     int_value = int(float_value)
-    has_no_dot = (literal.count(".") == 0)
-    if has_no_dot and (float_value == int_value):
+    if float_value == int_value:
         return int_value
-    raise TypeError
+    return FAILED
 
 
-def handle_numeric(literal, conv_func):
-    """Attempt to convert the given string literal to a value using the given
-    conversion function.
+def to_number(literal):
+    """Return a floating point number if the literal matches the pattern of a
+    number and float conversion is successful; see `try_number`.  A TypeError
+    is raised otherwise.
     """
-    try:
-        return conv_func(literal)
-    except ValueError:
-        raise TypeError
+    return checked(try_number(literal))
 
 
-def handle_percent(literal, regexes):
-    """Attempt to convert the given string literal to a number, which has a
-    percent sign.
+def to_float(literal):
+    """Return a floating point number for a float literal; see `try_float`.
+    A TypeError is raised otherwise.
+    """
+    return checked(try_float(literal))
+
+
+def to_integer(literal):
+    """Return an integer for an integer literal; see `try_integer`.  A
+    TypeError is raised otherwise.
+    """
+    return checked(try_integer(literal))
+
+
+def try_percent(literal, regexes):
+    """Return the number for the given string literal, which has a percent
+    sign, or `FAILED`.
     """
     for regex in regexes:
         percent = regex.search(literal)
@@ -152,14 +243,24 @@ def handle_percent(literal, regexes):
             negative, value = percent.groups()
             if value == '':  # Accounts for literals of '%'
                 continue
-            value = to_number(value) / 100
+            value = try_number(value)
+            if value is FAILED:
+                return FAILED
+            value /= 100
             return value * -1 if negative else value
-    raise TypeError
+    return FAILED
 
 
-def handle_currency(literal, regexes):
+def handle_percent(literal, regexes):
     """Attempt to convert the given string literal to a number, which has a
-    dollar sign.
+    percent sign.
+    """
+    return checked(try_percent(literal, regexes))
+
+
+def try_currency(literal, regexes):
+    """Return the number for the given string literal, which has a dollar
+    sign, or `FAILED`.
     """
     for regex in regexes:
         currency = regex.search(literal)
@@ -171,18 +272,31 @@ def handle_currency(literal, regexes):
                 multiplier = MULTIPLIERS.get(character.lower(), 1)
             else:
                 multiplier = 1
-            value = to_number(value) * multiplier
+            value = try_number(value)
+            if value is FAILED:
+                return FAILED
+            value *= multiplier
             return value * -1 if negative or parens else value
-    raise TypeError
+    return FAILED
+
+
+def handle_currency(literal, regexes):
+    """Attempt to convert the given string literal to a number, which has a
+    dollar sign.
+    """
+    return checked(try_currency(literal, regexes))
+
+
+def try_datetime(literal, patterns):
+    """Return the datetime object for the given string literal and list of
+    datetime formats, or `FAILED`.
+    """
+    found = tm.get_plan(patterns).find(literal)
+    return FAILED if found is None else found[0]
 
 
 def handle_datetime(literal, patterns):
     """Attempt to return a datetime object for the given string literal and
     list of datetime formats.
     """
-    for pattern in patterns:
-        try:
-            return datetime.strptime(literal, pattern)
-        except ValueError:
-            continue
-    raise TypeError
+    return checked(try_datetime(literal, patterns))
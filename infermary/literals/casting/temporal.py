@@ -0,0 +1,285 @@
+"""Library for fast parsing of datetime, date, and time literals against an
+ordered list of `strptime` formats.
+
+Notes
+-----
+* A `FormatPlan` dispatches on the separator signature of the literal: the
+  counts of the characters "-", "/", ":", ".", and "+".  None of the numeric
+  `strptime` directives can match these characters, so a format can only
+  accept a literal with exactly the same signature.  Formats that contain
+  non-numeric directives (e.g. `%p`) have no signature and are always
+  attempted.
+* Formats built only from `%Y`, `%y`, `%m`, `%d`, `%H`, `%M`, `%S`, and `%f`
+  also get a strict matcher that requires ASCII digits with fixed widths and
+  single spaces.  This covers the ISO layouts.  Every literal accepted by the
+  strict matcher is parsed by `strptime` to the same value (or rejected by
+  both), so a strict match is final; otherwise `strptime` decides.
+* Formats are attempted in the given order, skipping duplicates, so the
+  result is identical to a plain `strptime` loop.
+* A caller may pin an entry (typically the last winning format of a column)
+  to be attempted first.  A pinned match is only accepted if no earlier
+  format that could also accept the literal does so; formats are provably
+  disjoint if their signatures differ or if the non-digit, non-space
+  characters they admit (with `%p` expanded to the locale AM/PM strings)
+  differ.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+import re
+
+
+SEPARATORS = "-/:.+"
+
+# Maximum number of distinct signatures remembered per plan.
+MAX_DISPATCH = 256
+
+NUMERIC_DIRECTIVES = frozenset("dfGHIjmMSUuVwWyY")
+
+_STRICT_DIRECTIVES = {
+    "Y": r"([0-9]{4})",
+    "y": r"([0-9]{2})",
+    "m": r"([0-9]{2})",
+    "d": r"([0-9]{2})",
+    "H": r"([0-9]{2})",
+    "M": r"([0-9]{2})",
+    "S": r"([0-9]{2})",
+    "f": r"([0-9]{1,6})",
+}
+
+Entry = namedtuple(
+    "Entry", ["index", "format", "signature", "strict", "skeletons"]
+)
+
+Strict = namedtuple("Strict", ["regex", "directives"])
+
+
+def _tokenize(format_):
+    """Return the list of (is_directive, character) tokens of a format."""
+    tokens = []
+    i = 0
+    while i < len(format_):
+        if format_[i] == "%" and i + 1 < len(format_):
+            tokens.append((True, format_[i + 1]))
+            i += 2
+        else:
+            tokens.append((False, format_[i]))
+            i += 1
+    return tokens
+
+
+def signature(literal):
+    """Return the separator signature of the given literal or format text.
+    """
+    return tuple(literal.count(char) for char in SEPARATORS)
+
+
+def _format_signature(tokens):
+    """Return the separator signature required by the format tokens, or None
+    if the format has a directive that could match a separator.
+    """
+    for is_dir, char in tokens:
+        if is_dir and char not in NUMERIC_DIRECTIVES:
+            return None
+    return signature("".join(char for is_dir, char in tokens if not is_dir))
+
+
+def _am_pm():
+    """Return the lowercased locale AM/PM strings, or None if they are not
+    purely alphabetic.
+    """
+    am_pm = [datetime(2000, 1, 1, hour).strftime("%p").lower()
+             for hour in (1, 13)]
+    if all(text.isalpha() for text in am_pm):
+        return am_pm
+    return None
+
+
+def _format_skeletons(tokens, am_pm):
+    """Return the set of reduced forms (non-digit, non-space characters,
+    lowercased) of the literals accepted by the format tokens, or None if the
+    forms cannot be enumerated.
+    """
+    forms = [""]
+    for is_dir, char in tokens:
+        if not is_dir:
+            if char.isdigit():
+                return None
+            if not char.isspace():
+                forms = [form + char.lower() for form in forms]
+        elif char == "p" and am_pm is not None:
+            forms = [form + text for form in forms for text in am_pm]
+        elif char not in NUMERIC_DIRECTIVES:
+            return None
+    return frozenset(forms)
+
+
+def _disjoint(entry, other):
+    """Return True if the two entries cannot accept the same literal."""
+    if None not in (entry.signature, other.signature):
+        if entry.signature != other.signature:
+            return True
+    if None in (entry.skeletons, other.skeletons):
+        return False
+    return not entry.skeletons & other.skeletons
+
+
+def _strict_matcher(tokens):
+    """Return the strict matcher for the format tokens, or None if the format
+    has no strict equivalent.
+    """
+    directives = [char for is_dir, char in tokens if is_dir]
+    if len(set(directives)) != len(directives):
+        return None
+    if not set(directives) <= set(_STRICT_DIRECTIVES):
+        return None
+    pattern = "".join(
+        _STRICT_DIRECTIVES[char] if is_dir
+        else (" " if char.isspace() else re.escape(char))
+        for is_dir, char in tokens
+    )
+    return Strict(re.compile(pattern + r"\Z"), directives)
+
+
+def _from_strict(strict, found):
+    """Return the datetime for the groups of a strict match.  A ValueError is
+    raised if the fields are out of range.
+    """
+    fields = {"Y": 1900, "m": 1, "d": 1, "H": 0, "M": 0, "S": 0, "f": 0}
+    for directive, group in zip(strict.directives, found.groups()):
+        if directive == "y":
+            year = int(group)
+            fields["Y"] = year + (2000 if year <= 68 else 1900)
+        elif directive == "f":
+            fields["f"] = int(group.ljust(6, "0"))
+        else:
+            fields[directive] = int(group)
+    return datetime(
+        fields["Y"], fields["m"], fields["d"],
+        fields["H"], fields["M"], fields["S"], fields["f"]
+    )
+
+
+class FormatPlan:
+    """Precompiled parser for an ordered list of `strptime` formats."""
+
+    def __init__(self, formats):
+        self.formats = list(dict.fromkeys(formats))
+        self.entries = []
+        am_pm = _am_pm()
+        for index, format_ in enumerate(self.formats):
+            tokens = _tokenize(format_)
+            self.entries.append(Entry(
+                index,
+                format_,
+                _format_signature(tokens),
+                _strict_matcher(tokens),
+                _format_skeletons(tokens, am_pm),
+            ))
+        self.guards = [
+            [other for other in self.entries[:entry.index]
+             if not _disjoint(entry, other)]
+            for entry in self.entries
+        ]
+        self._dispatch = {}
+
+    def candidates(self, literal):
+        """Return the ordered entries that could accept the given literal.
+        """
+        sig = signature(literal)
+        try:
+            return self._dispatch[sig]
+        except KeyError:
+            entries = [
+                entry for entry in self.entries
+                if entry.signature is None or entry.signature == sig
+            ]
+            if len(self._dispatch) < MAX_DISPATCH:
+                self._dispatch[sig] = entries
+            return entries
+
+    def parse_entry(self, literal, entry):
+        """Return the datetime for the literal and a single format entry, or
+        None if the format does not accept the literal.
+        """
+        if entry.strict is not None:
+            found = entry.strict.regex.match(literal)
+            if found is not None:
+                try:
+                    return _from_strict(entry.strict, found)
+                except ValueError:
+                    return None
+        try:
+            return datetime.strptime(literal, entry.format)
+        except ValueError:
+            return None
+
+    def find(self, literal, pinned=None):
+        """Return a tuple (datetime, entry) for the first format that accepts
+        the literal, or None if no format matches.  If an entry is pinned, it
+        is attempted first.
+        """
+        if pinned is not None:
+            value = self.parse_entry(literal, pinned)
+            if value is not None and all(
+                self.parse_entry(literal, guard) is None
+                for guard in self.guards[pinned.index]
+            ):
+                return value, pinned
+        for entry in self.candidates(literal):
+            value = self.parse_entry(literal, entry)
+            if value is not None:
+                return value, entry
+        return None
+
+    def match(self, literal, pinned=None):
+        """Return a tuple (datetime, entry) for the first format that accepts
+        the literal, see `find`.  A TypeError is raised if no format matches.
+        """
+        found = self.find(literal, pinned)
+        if found is None:
+            raise TypeError
+        return found
+
+    def parse(self, literal):
+        """Return the datetime for the first format that accepts the literal.
+        A TypeError is raised if no format matches.
+        """
+        return self.match(literal)[0]
+
+
+_PLANS = {}
+
+
+def get_plan(formats):
+    """Return the (cached) plan for the given list of formats."""
+    key = tuple(formats)
+    try:
+        return _PLANS[key]
+    except KeyError:
+        return _PLANS.setdefault(key, FormatPlan(key))
+
+
+def disjoint_formats(formats, other):
+    """Return True if no literal is accepted by both a format of the first
+    list and a format of the other list.
+    """
+    return all(
+        _disjoint(entry, other_entry)
+        for entry in get_plan(formats).entries
+        for other_entry in get_plan(other).entries
+    )
+
+
+def warmup(formats):
+    """Build the plan for the given formats and have `strptime` compile the
+    regex of each format (importing `_strptime` on the first call), so that
+    the first literals parsed pay neither cost.  Return the plan.
+    """
+    plan = get_plan(formats)
+    for entry in plan.entries:
+        try:
+            datetime.strptime("", entry.format)
+        except ValueError:
+            pass
+    return plan
@@ -0,0 +1,127 @@
+"""Module holding a single-pass classifier that narrows the ordered list of
+types to those a string literal could possibly be cast to.
+
+Notes
+-----
+* Each prefilter is a necessary (not sufficient) condition for the
+  corresponding caster to succeed, evaluated against the set of characters
+  found in the literal.  A type that passes its prefilter must still be
+  confirmed by the caster; a type that fails its prefilter is never attempted.
+* Types without a registered prefilter are always retained.
+"""
+
+from infermary.literals.casting import formats as fmt
+
+
+_MISSING = frozenset(fmt.MISSING)
+
+_BOOLEAN = frozenset(fmt.TRUE + fmt.FALSE)
+
+# Characters (lowercased) that may appear in a literal accepted by `float`
+# after the numeric comma handling in the casting helpers.
+_NUMERIC_CHARS = frozenset("0123456789+-.,e_")
+
+# Special values accepted by `float`, compared after stripping a sign.
+_NUMERIC_WORDS = frozenset(["inf", "infinity", "nan"])
+
+
+def _format_chars(format_):
+    """Return the set of lowercased literal characters required by the given
+    `strptime` format.  Directives and whitespace are skipped, since
+    `strptime` matches whitespace loosely and ignores case.
+    """
+    chars = set()
+    i = 0
+    while i < len(format_):
+        char = format_[i]
+        if char == "%":
+            i += 2
+            continue
+        if not char.isspace():
+            chars.add(char.lower())
+        i += 1
+    return frozenset(chars)
+
+
+def _maybe_missing(literal, _chars):
+    return literal in _MISSING
+
+
+def _maybe_boolean(literal, _chars):
+    return literal in _BOOLEAN
+
+
+def _maybe_numeric(literal, chars):
+    if chars <= _NUMERIC_CHARS:
+        return True
+    if not literal.isascii():
+        return True
+    return literal.lstrip("+-").lower() in _NUMERIC_WORDS
+
+
+def _maybe_percent(_literal, chars):
+    return "%" in chars
+
+
+def _maybe_currency(_literal, chars):
+    return "$" in chars
+
+
+def _maybe_temporal(formats):
+    """Return a prefilter that passes if the literal holds every required
+    character of at least one of the given formats.
+    """
+    required = [_format_chars(format_) for format_ in formats]
+
+    def _prefilter(_literal, chars):
+        return any(req <= chars for req in required)
+
+    return _prefilter
+
+
+_PREFILTERS = {
+    "missing": _maybe_missing,
+    "integer": _maybe_numeric,
+    "float": _maybe_numeric,
+    "number": _maybe_numeric,
+    "boolean": _maybe_boolean,
+    "date": _maybe_temporal(fmt.DATE),
+    "time": _maybe_temporal(fmt.TIME),
+    "datetime": _maybe_temporal(fmt.DATETIME),
+    "datelike": _maybe_temporal(fmt.DATELIKE),
+    "percent": _maybe_percent,
+    "currency": _maybe_currency,
+}
+
+
+def literal_chars(literal):
+    """Return the set of lowercased characters of the literal, as given to
+    the prefilters.
+    """
+    return frozenset(literal.lower())
+
+
+def passes(type_, literal, chars):
+    """Return True if the prepared literal, with the given characters (see
+    `literal_chars`), passes the prefilter of the type.
+    """
+    prefilter = _PREFILTERS.get(type_)
+    return prefilter is None or prefilter(literal, chars)
+
+
+def candidate_types(literal, inferred_types):
+    """Lazily yield the types from the given ordered list that the prepared
+    (stripped) literal could possibly be cast to, preserving the order.
+
+    Examples
+    --------
+    >>> list(candidate_types("foo", ["missing", "integer", "date", "string"]))
+    ["string"]
+    >>> list(candidate_types("1", ["missing", "integer", "date", "string"]))
+    ["integer", "string"]
+    """
+    chars = frozenset(literal.lower())
+    for type_ in inferred_types:
+        prefilter = _PREFILTERS.get(type_)
+        if prefilter is None or prefilter(literal, chars):
+            yield type_
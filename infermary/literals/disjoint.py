@@ -0,0 +1,77 @@
+"""Library deriving which registered types never accept the same literal.
+
+Notes
+-----
+* Disjoint pairs are derived from the casters: "integer" literals have no
+  decimal point and a float value equal to their integer value, while
+  "float" literals have a decimal point or a value in (0, 1); the numeric
+  types never accept ":", "/", "%", "$", or a "-" after a digit, which the
+  percent and currency casters, and the temporal formats that hold them,
+  require; temporal formats never accept "%" nor "$"; and temporal types are
+  disjoint if all their format pairs are (see `temporal`).
+"""
+
+from infermary.literals import types as tp
+from infermary.literals.casting import casters, temporal as tm
+
+
+NUMERIC_TYPES = frozenset(["integer", "float", "number"])
+
+# Types whose literals hold a character that the numeric and temporal types
+# never accept.
+SYMBOL_TYPES = frozenset(["percent", "currency"])
+
+
+def _excludes_numbers(format_):
+    """Return True if no literal accepted by the `strptime` format is
+    accepted by `float`: the format holds a ":" or "/", or a "-" right after
+    a numeric directive (whose matches end with a digit).
+    """
+    if ":" in format_ or "/" in format_:
+        return True
+    return any(f"%{char}-" in format_ for char in tm.NUMERIC_DIRECTIVES)
+
+
+def _disjoint(type_, other):
+    """Return True if no literal can be cast to both types."""
+    pair = {type_, other}
+    if pair == {"integer", "float"}:
+        return True
+    if pair <= NUMERIC_TYPES:
+        return False
+    temporal = [t for t in (type_, other) if t in casters.TEMPORAL]
+    rest = pair.difference(temporal)
+    if len(temporal) == 2:
+        return tm.disjoint_formats(
+            casters.TEMPORAL[type_][0], casters.TEMPORAL[other][0]
+        )
+    if len(temporal) == 1:
+        formats = casters.TEMPORAL[temporal[0]][0]
+        if rest <= NUMERIC_TYPES:
+            return all(map(_excludes_numbers, formats))
+        if rest <= SYMBOL_TYPES:
+            return not any(
+                "%%" in format_ or "$" in format_ for format_ in formats
+            )
+        return False
+    return len(pair & NUMERIC_TYPES) == 1 and len(pair & SYMBOL_TYPES) == 1
+
+
+_DISJOINT = None
+
+
+def disjoint_types():
+    """Return the (cached) dict mapping each registered type to the set of
+    types disjoint from it.
+    """
+    global _DISJOINT  # pylint: disable=global-statement
+    if _DISJOINT is None:
+        types = list(tp.ORDERED_TYPE_TO_CASTER)
+        _DISJOINT = {
+            type_: frozenset(
+                other for other in types
+                if other != type_ and _disjoint(type_, other)
+            )
+            for type_ in types
+        }
+    return _DISJOINT
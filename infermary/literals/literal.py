@@ -1,35 +1,55 @@
-"""Module exposing the `cast` and `infer_type` functions for single literals.
+"""Module exposing the `cast`, `try_cast`, and `infer_type` functions for
+single literals.
 """
 
-from infermary.literals import types as tp, helpers as hp
+from infermary.literals import types as tp, helpers as hp, classify as cl
+from infermary.literals.casting import casters, temporal as tm
 from infermary.exceptions import CastError, FatalCastError
 
+FAILED = casters.FAILED
+
+
+def try_cast(literal, type_):
+    """Return the value object for the given string literal and type, or the
+    `FAILED` sentinel if the cast fails.
+    """
+    lit = hp.check_and_prepare_literal(literal)
+    return tp.lookup_try_caster(type_)(lit)
+
 
 def cast(literal, type_):
     """Return the value object for the given string literal and type.
     """
-    try:
-        lit = hp.check_and_prepare_literal(literal)
-        caster = tp.lookup_caster(type_)
-        return caster(lit)
-    except TypeError:
+    value = try_cast(literal, type_)
+    if value is FAILED:
         raise CastError(
             f"The input '{literal}' cannot be cast to a value of type "
             f"'{type_}'."
         )
+    return value
+
+
+def uncastable_error(literal):
+    """Return the error raised when no inferred type accepts the literal."""
+    return FatalCastError(
+        f"The input '{literal}' could not be cast to any registered type. "
+        "This probably means the list of types is incomplete."
+    )
 
 
 def infer_type(literal, inferred_types):
     """Return the inferred type of the given string literal for the given list
-    of allowed types.
+    of allowed types.  The literal is prepared once, and only the casters of
+    types that pass the single-pass classifier are attempted.
     """
-    for type_ in inferred_types:
-        try:
-            cast(literal, type_)
+    lit = hp.check_and_prepare_literal(literal)
+    for type_ in cl.candidate_types(lit, inferred_types):
+        if tp.lookup_try_caster(type_)(lit) is not FAILED:
             return type_
-        except CastError:
-            continue
-    raise FatalCastError(
-        f"The input '{literal}' could not be cast to any registered type. "
-        "This probably means the list of types is incomplete."
-    )
+    raise uncastable_error(literal)
+
+
+def warmup():
+    """Build and compile the format matchers of all temporal types."""
+    for formats, _ in casters.TEMPORAL.values():
+        tm.warmup(formats)
@@ -0,0 +1,116 @@
+"""Library holding a column-aware type inferrer, which attempts the types
+that already won in a column before the rest of the ordered type list.
+
+Notes
+-----
+* The inferred type of a literal is the first type of the ordered list
+  whose caster accepts it.  When a type that won earlier in the column
+  accepts the literal, the earlier candidate types (those that pass the
+  classifier prefilters) must still be attempted, unless they are provably
+  disjoint from the winner, i.e. no literal is accepted by both.  The result
+  is thus always identical to `literal.infer_type`.
+* Disjoint pairs are derived from the casters (see `disjoint`).
+* Only types disjoint from an earlier type gain from being attempted first.
+  Those that won are attempted by decreasing count in the column, so a
+  consistent datetime, percent, or currency column pays for one caster (and
+  the overlapping earlier types) per literal.
+* Literals of a shape already seen are inferred by the shared `shapes`
+  cache instead, which skips the types that the shape decides.
+"""
+
+from collections import Counter
+
+from infermary.literals import (
+    classify as cl,
+    disjoint as dj,
+    helpers as hp,
+    literal as lt,
+    shapes as sh,
+    types as tp,
+)
+from infermary.literals.casting import casters
+
+FAILED = casters.FAILED
+
+
+class ColumnInferrer:
+    """Callable that infers the types of the successive literals of one
+    column for the ordered list of types, attempting the types that won in
+    the column first.  If a `LiteralCache` is given, results are shared with
+    `LiteralCache.infer_type`.
+    """
+
+    def __init__(self, inferred_types, cache=None):
+        self.inferred_types = list(inferred_types)
+        self.cache = cache
+        self.counts = Counter()
+        self.winners = []
+        disjoint = dj.disjoint_types()
+        # For each type that is disjoint from an earlier type, the earlier
+        # types that must be attempted when it accepts a literal.  Other
+        # types gain nothing from being attempted first.
+        self._overlaps = {}
+        for index, type_ in enumerate(self.inferred_types):
+            earlier = self.inferred_types[:index]
+            overlaps = [t for t in earlier if t not in disjoint[type_]]
+            if len(overlaps) < len(earlier):
+                self._overlaps[type_] = overlaps
+        self._key = tuple(self.inferred_types)
+        self._shapes = sh.get_cache(self.inferred_types)
+
+    def __call__(self, literal):
+        if self.cache is not None and isinstance(literal, str):
+            type_ = self.cache.memoize(
+                ("infer", literal, self._key), self._infer, literal
+            )
+        else:
+            type_ = self._infer(literal)
+        if type_ in self._overlaps:
+            self._rank(type_)
+        return type_
+
+    def _rank(self, type_):
+        """Count the winning type, keeping the winners that prune types by
+        decreasing count.
+        """
+        counts, winners = self.counts, self.winners
+        counts[type_] += 1
+        if counts[type_] == 1:
+            winners.append(type_)
+            return
+        index = winners.index(type_)
+        if index and counts[winners[index - 1]] < counts[type_]:
+            winners[index - 1], winners[index] = type_, winners[index - 1]
+
+    def _infer(self, literal):
+        """Return the inferred type of the literal through the shape cache,
+        attempting the winners first for unknown shapes.
+        """
+        if not self.winners:
+            return self._shapes.infer_type(literal)
+        return self._shapes.infer_type(literal, self._infer_winners)
+
+    def _infer_winners(self, literal):
+        lit = hp.check_and_prepare_literal(literal)
+        chars = cl.literal_chars(lit)
+        try_casters = tp.TYPE_TO_TRY_CASTER
+        failed = ()
+        for winner in self.winners:
+            if not (
+                cl.passes(winner, lit, chars)
+                and try_casters[winner](lit) is not FAILED
+            ):
+                failed += (winner,)
+                continue
+            for type_ in cl.candidate_types(lit, self._overlaps[winner]):
+                if type_ in failed:
+                    continue
+                if try_casters[type_](lit) is not FAILED:
+                    return type_
+            return winner
+        for type_ in cl.candidate_types(lit, self.inferred_types):
+            if type_ in failed:
+                continue
+            if try_casters[type_](lit) is not FAILED:
+                return type_
+        raise lt.uncastable_error(literal)
@@ -0,0 +1,224 @@
+"""Library holding a cache of inferred types keyed by literal shapes, which
+lets high-cardinality columns skip most caster attempts.
+
+Notes
+-----
+* The shape of a prepared literal maps ASCII letters to "a" and ASCII
+  digits to "9", except that a "0" starting a run of digits is kept (e.g.
+  "2017-01-30" becomes "9999-09-99"); other characters are kept.  Lengths
+  are preserved, unlike the shapes of `SchemaCache` fingerprints.
+* The casters are attempted in order on the first literal of a shape.  An
+  earlier type that failed is then skipped for the other literals of the
+  shape if the shape alone decides its failure:
+  - "missing" and "boolean" fail unless the shape is that of a sentinel;
+  - the numeric types are decided without ASCII letters, or with two or
+    more that do not spell (after a sign) a word accepted by `float`, since
+    the number rules depend on digits, a leading "0", and separators only,
+    unless the shape has `MAX_FINITE_DIGITS` digits or more, where the
+    magnitude decides whether "integer" overflows;
+  - "percent" and "currency" are always decided, since their patterns only
+    distinguish digits (and the multiplier letters are optional);
+  - a temporal type is decided if no format has the separator signature of
+    the shape or, for ASCII shapes, admits its non-digit characters (see
+    `temporal`).
+* The type that accepted the first literal is attempted first; it is
+  accepted without an attempt where the shape decides it as above.  If it
+  accepts, only the undecided earlier types that are not disjoint from it
+  (see `disjoint`) are attempted; otherwise the undecided earlier types and
+  then the later types are.  The result is thus always identical to
+  `literal.infer_type`.
+* At most `MAX_SHAPES` shapes are remembered per list of types; literals of
+  other shapes are always inferred in full.  The caches are shared by the
+  threads of a process, whose counters are then approximate.
+"""
+
+import re
+import string
+
+from infermary.literals import (
+    classify as cl,
+    disjoint as dj,
+    helpers as hp,
+    literal as lt,
+    types as tp,
+)
+from infermary.literals.casting import casters, formats as fmt, temporal as tm
+
+FAILED = casters.FAILED
+
+# Maximum number of shapes remembered per list of types.
+MAX_SHAPES = 4096
+
+_SHAPE_TABLE = str.maketrans(
+    string.digits + string.ascii_letters,
+    "0" + "9" * 9 + "a" * len(string.ascii_letters),
+)
+
+# A "0" that continues a run of digits.
+_INNER_ZEROS = re.compile(r"(?<=[09])0")
+
+# Number of digits from which a number may exceed the largest float, which
+# "integer" rejects (e.g. "1" + "0" * 308 is an integer, "2" + "0" * 308
+# is not).
+MAX_FINITE_DIGITS = 309
+
+# Shapes (after a sign) of the special words accepted by `float`.
+_NUMERIC_WORDS = frozenset(["aaa", "aaaaaaaa"])
+
+_REDUCE_TABLE = str.maketrans("", "", "09")
+
+
+def shape(literal):
+    """Return the shape of the prepared literal, e.g. "-9a-9" for "-1e-5".
+    """
+    key = literal.translate(_SHAPE_TABLE)
+    if "90" in key or "00" in key:
+        key = _INNER_ZEROS.sub("9", key)
+    return key
+
+
+def _sentinel_shapes(type_):
+    sentinels = fmt.MISSING if type_ == "missing" else fmt.TRUE + fmt.FALSE
+    return frozenset(map(shape, sentinels))
+
+
+def _numeric_decided(key):
+    """Return True if all the literals of the shape are accepted (or all
+    rejected) by each numeric type.
+    """
+    if key.count("9") + key.count("0") >= MAX_FINITE_DIGITS:
+        return False
+    letters = key.count("a")
+    if letters == 0:
+        return True
+    return letters > 1 and key.lstrip("+-") not in _NUMERIC_WORDS
+
+
+def _temporal_excluded(type_, literal, key):
+    """Return True if no literal of the shape of the given literal can be
+    cast to the temporal type.
+    """
+    entries = tm.get_plan(casters.TEMPORAL[type_][0]).candidates(literal)
+    if not entries:
+        return True
+    if not key.isascii():
+        return False
+    reduced = "".join(key.split()).translate(_REDUCE_TABLE)
+    for entry in entries:
+        if entry.skeletons is None:
+            return False
+        skeletons = {form.translate(_SHAPE_TABLE) for form in entry.skeletons}
+        if reduced in skeletons:
+            return False
+    return True
+
+
+def _excluded(type_, literal, key):
+    """Return True if the shape of the literal, which the type rejects,
+    decides that the type rejects all the literals of the shape.
+    """
+    if type_ in ("missing", "boolean"):
+        return key not in _sentinel_shapes(type_)
+    if type_ in dj.NUMERIC_TYPES:
+        return _numeric_decided(key)
+    if type_ in dj.SYMBOL_TYPES:
+        return True
+    if type_ in casters.TEMPORAL:
+        return _temporal_excluded(type_, literal, key)
+    return False
+
+
+def _decided(type_, key):
+    """Return True if the shape decides that the type, which accepts a
+    literal of the shape, accepts all of them.
+    """
+    if type_ == "string":
+        return True
+    if type_ in dj.NUMERIC_TYPES:
+        return _numeric_decided(key)
+    return type_ in dj.SYMBOL_TYPES
+
+
+class ShapeCache:
+    """Cache of the inferred types of literal shapes for an ordered list of
+    types, with hit and miss counters.
+    """
+
+    def __init__(self, inferred_types):
+        self.inferred_types = list(inferred_types)
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, literal, key, type_):
+        """Return the entry of the shape for its first literal and inferred
+        type: the tuple (type, decided, undecided earlier types, those of
+        them not disjoint from the type, later types).
+        """
+        index = self.inferred_types.index(type_)
+        undecided = tuple(
+            other for other in self.inferred_types[:index]
+            if not _excluded(other, literal, key)
+        )
+        disjoint = dj.disjoint_types()[type_]
+        guards = tuple(other for other in undecided if other not in disjoint)
+        later = tuple(self.inferred_types[index + 1:])
+        return type_, _decided(type_, key), undecided, guards, later
+
+    def infer_type(self, literal, infer=None):
+        """Return the inferred type of the literal, see
+        `literals.literal.infer_type`.  The literals of unknown shapes are
+        inferred by `infer(literal)` if given.
+        """
+        lit = hp.check_and_prepare_literal(literal)
+        key = shape(lit)
+        try:
+            type_, decided, undecided, guards, later = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            if infer is None:
+                type_ = lt.infer_type(lit, self.inferred_types)
+            else:
+                type_ = infer(literal)
+            if len(self._entries) < MAX_SHAPES:
+                self._entries[key] = self._entry(lit, key, type_)
+            return type_
+        self.hits += 1
+        try_casters = tp.TYPE_TO_TRY_CASTER
+        if decided or try_casters[type_](lit) is not FAILED:
+            for other in guards:
+                if try_casters[other](lit) is not FAILED:
+                    return other
+            return type_
+        for other in undecided:
+            if try_casters[other](lit) is not FAILED:
+                return other
+        for other in cl.candidate_types(lit, later):
+            if try_casters[other](lit) is not FAILED:
+                return other
+        raise lt.uncastable_error(literal)
+
+    def stats(self):
+        """Return a dict with the cache counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def clear(self):
+        """Remove the entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+_CACHES = {}
+
+
+def get_cache(inferred_types):
+    """Return the (shared) shape cache for the ordered list of types."""
+    key = tuple(inferred_types)
+    try:
+        return _CACHES[key]
+    except KeyError:
+        return _CACHES.setdefault(key, ShapeCache(key))
+
@@ -22,6 +22,23 @@ ORDERED_TYPE_TO_CASTER = OrderedDict([
     ("string", casters.string_)
 ])
 
+# Mapping between type names and non-raising caster functions, which return
+# `casters.FAILED` if the cast fails.
+TYPE_TO_TRY_CASTER = {
+    "missing": casters.try_missing,
+    "integer": casters.try_integer,
+    "float": casters.try_float,
+    "number": casters.try_number,
+    "boolean": casters.try_boolean,
+    "date": casters.try_date,
+    "time": casters.try_time,
+    "datetime": casters.try_datetime,
+    "datelike": casters.try_datelike,
+    "percent": casters.try_percent,
+    "currency": casters.try_currency,
+    "string": casters.try_string,
+}
+
 # Default ordered list of inferred types.
 DEFAULT_ORDERED_INFERRED_TYPES = [
     "missing",
@@ -62,3 +79,12 @@ def lookup_caster(type_):
         return ORDERED_TYPE_TO_CASTER[type_]
     except KeyError:
         raise UnregisteredTypeError(f"Type '{type_}' is not registered.")
+
+
+def lookup_try_caster(type_):
+    """Return the non-raising cast function for the given type.
+    """
+    try:
+        return TYPE_TO_TRY_CASTER[type_]
+    except KeyError:
+        raise UnregisteredTypeError(f"Type '{type_}' is not registered.")
@@ -4,15 +4,65 @@ tabular data.
 
 from infermary import error_catcher as ec
 from infermary.literals import types as tp
-from infermary.tables import table as tb
+from infermary.literals import cache as lc
+from infermary.tables import (
+    aio,
+    files as fl,
+    parallel as pl,
+    table as tb,
+)
+from infermary.tables.casting import cast as cs, layout as ly
+from infermary.tables.inferring import cache as sc, state as st
 
 MAX_SAMPLE = 1000
 
 
-def cast(table, schema, parallel=False):
+def cast(
+    table,
+    schema,
+    parallel=False,
+    report_formats=False,
+    cache=None,
+    transport="pickle",
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
     """Return a table of value objects given a table of literal values and a
     schema.  If `parallel` is True, the casting computation is performed in
-    parallel.
+    parallel; it may also be a backend name ("serial", "threads", or
+    "processes"), a `WorkerPool`, or a `concurrent.futures` executor.  If
+    `report_formats` is True, the result holds an additional `formats` field
+    with the counts of the datetime formats used to cast each column.  If
+    `cache` is True, repeated literals are cast once per call; a
+    `LiteralCache` instance may be passed to reuse it across calls.  With
+    `transport="shared"`, parallel casting passes each column to the workers
+    once through shared memory, and numeric and boolean results come back
+    the same way, instead of pickling them.  With `engine="numpy"` (or
+    "auto", which uses NumPy only if it is installed), missing, integer,
+    float, number, and boolean columns are cast as vectorized batch
+    operations with the same results.
+
+    With `layout="columns"`, the result holds the number of rows `length`
+    and a list of `columns` instead of `rows`, each with the `name`, `type`,
+    `values`, and a `validity` bitmap of the column: integer values are
+    packed into `array("q")`, float, number, percent, and currency values
+    into `array("d")`, and boolean values into `bytes`; other columns (or
+    values that do not fit) are kept as lists.  Missing and failed cells have
+    a cleared validity bit.  See `to_rows` to convert the result back to
+    rows.
+
+    With `dictionary=True`, each column is dictionary-encoded: each distinct
+    literal is cast once, and the values of the rows share the value objects
+    of their literal.  With `dictionary="auto"`, only the columns where at
+    most half the literals are distinct are encoded.  With the columns
+    layout, an encoded column holds the list of values of its distinct
+    literals as `dictionary`, and the index of the value of each row in an
+    unsigned array as `codes`, instead of `values`; `to_rows` expands it.
+
+    The table rows may be a list or any iterable of rows, such as a
+    generator; serial casting with the row layout consumes them one row at a
+    time.
 
     The input table and schema have the forms
 
@@ -26,17 +76,92 @@ def cast(table, schema, parallel=False):
     >>> cast(table, schema)
     {"header": ["A", "B"], "rows": [[1, "foo"], [2, "bar"]]}
     """
-    return tb.cast(table, schema, parallel)
+    return tb.cast(
+        table, schema, parallel, report_formats, cache, transport, engine,
+        layout, dictionary
+    )
+
+
+def cast_iter(
+    table,
+    schema,
+    batch_size=cs.BATCH_SIZE,
+    parallel=False,
+    max_in_flight=None,
+    report_formats=False,
+    cache=None,
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
+    """Return an iterator over the tables of value objects of successive
+    batches of at most `batch_size` rows, so that a table of any size is
+    cast in bounded memory.  The rows are read lazily, one batch at a time.
+    If `parallel` is set (see `cast`), the batches are cast by the pool or
+    backend, each one serially, and yielded in order; at most
+    `max_in_flight` batches (by default, twice the number of CPUs) are read
+    ahead of the consumer, so a slow consumer holds back the reading.  A
+    fresh pool is closed once the iteration ends.  The other parameters
+    apply to each batch as in `cast`; in particular, with `layout="columns"`
+    each batch is a columnar table.
+
+    Examples
+    --------
+    >>> for batch in cast_iter(table, schema, batch_size=1):
+    ...     print(batch)
+    {"header": ["A", "B"], "rows": [[1, "foo"]]}
+    {"header": ["A", "B"], "rows": [[2, "bar"]]}
+    """
+    return tb.cast_iter(
+        table, schema, batch_size, parallel, max_in_flight, report_formats,
+        cache, engine, layout, dictionary
+    )
 
 
 def infer_schema(
-    table, inferred_types=None, max_sample=MAX_SAMPLE, parallel=False
+    table,
+    inferred_types=None,
+    max_sample=MAX_SAMPLE,
+    parallel=False,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    schema_cache=None,
 ):
     """Return the inferred schema for the given table of string literals and
     list of inferred types.   If inferred types are not provided, a default
     list is used. The parameters `max_sample` is the maximum sample size of
     non-empty literals used for type inference. If `parallel` is True, the
-    inference computation is performed in parallel.
+    inference computation is performed in parallel; it may also be a
+    backend name ("serial", "threads", or "processes"), a `WorkerPool`, or a
+    `concurrent.futures` executor.  If `cache` is True,
+    repeated literals are inferred once per call; a `LiteralCache` instance
+    may be passed to reuse it across calls.
+
+    The `sampling` strategy selects the non-empty literals of each column:
+    "head" (the first `max_sample`), "stride" (every tenth), "reservoir"
+    (uniformly at random, seeded), "head+tail" (the first and last halves),
+    or a factory that takes `max_sample` and returns a sampler from
+    `infermary.tables.inferring.sample`.  Reading stops early for "head" and
+    "stride".
+
+    If `early_stop` is True, the literals of each column are inferred one at
+    a time until the leading non-missing type can no longer be overtaken
+    within the remaining sample, which gives the same schema with fewer
+    inferences.  If `early_stop` is a confidence threshold in (0, 1], a
+    column also stops once its leading type holds that fraction of the
+    non-missing literals examined (at least `vote.MIN_EXAMINED` of them),
+    which may change the result.  With early stopping, each schema entry
+    also holds the number of literals `examined`.
+
+    If a `SchemaCache` is given, tables with the same header, inferred types,
+    sampling parameters, and shapes of literals in their first rows share a
+    cached schema, which is returned without inference as long as those rows
+    still cast under it and vote for no earlier type.  Custom sampling
+    factories bypass the cache.
+
+    The table rows may be a list or any iterable of rows, such as a
+    generator; only the rows needed to fill the column samples are read.
 
     The input table has the form
 
@@ -50,8 +175,244 @@ def infer_schema(
     ]
     """
     ordered_inferred_types = tp.order_inferred_types(inferred_types)
-    return tb.infer_schema(table, ordered_inferred_types, max_sample, parallel)
+    return tb.infer_schema(
+        table,
+        ordered_inferred_types,
+        max_sample,
+        parallel,
+        cache,
+        sampling,
+        early_stop,
+        schema_cache,
+    )
+
+
+def cast_from_path(
+    path,
+    schema,
+    parallel=False,
+    report_formats=False,
+    cache=None,
+    delimiter=",",
+    encoding="utf-8",
+    transport="pickle",
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
+    """Return a table of value objects given the path of a delimited text
+    file, whose first line is the header, and a schema.  Gzip-compressed
+    files are read transparently.  See `cast` for the other parameters.
+
+    Examples
+    --------
+    >>> cast_from_path("data.csv.gz", schema)
+    {"header": ["A", "B"], "rows": [[1, "foo"], [2, "bar"]]}
+    """
+    with fl.open_table(path, delimiter, encoding) as table:
+        return cast(
+            table, schema, parallel, report_formats, cache, transport,
+            engine, layout, dictionary
+        )
+
+
+def infer_schema_from_path(
+    path,
+    inferred_types=None,
+    max_sample=MAX_SAMPLE,
+    parallel=False,
+    cache=None,
+    delimiter=",",
+    encoding="utf-8",
+    random_offsets=0,
+    head_rows=None,
+    offset_rows=fl.OFFSET_ROWS,
+    seed=None,
+    sampling="head",
+    early_stop=False,
+    schema_cache=None,
+):
+    """Return the inferred schema for the delimited text file at the given
+    path, whose first line is the header.  The file is read lazily and
+    reading stops once every column sample is full.  Gzip-compressed files
+    are read transparently.
+
+    If `random_offsets` is positive, the sample is taken from the first
+    `head_rows` rows (by default, half of `max_sample`) followed by
+    `offset_rows` rows at each of `random_offsets` random positions of the
+    memory-mapped file, seeded by `seed`.  This requires an uncompressed
+    file.  See `infer_schema` for the other parameters.
+
+    Examples
+    --------
+    >>> infer_schema_from_path("data.csv", random_offsets=100, seed=0)
+    [
+        {"name": "A", "type": "integer"},
+        {"name": "B", "type": "string"}
+    ]
+    """
+    if random_offsets and head_rows is None:
+        head_rows = max_sample // 2
+    with fl.open_table(
+        path,
+        delimiter,
+        encoding,
+        head_rows,
+        random_offsets,
+        offset_rows,
+        seed,
+    ) as table:
+        return infer_schema(
+            table,
+            inferred_types,
+            max_sample,
+            parallel,
+            cache,
+            sampling,
+            early_stop,
+            schema_cache,
+        )
+
+
+def ainfer_columns(
+    table,
+    inferred_types=None,
+    max_sample=MAX_SAMPLE,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    executor=None,
+    semaphore=None,
+):
+    """Return an asynchronous iterator over the schema entries of the table
+    columns, each yielded as soon as it is inferred.  The work is run in the
+    given `concurrent.futures` executor (by default, the event loop's default
+    executor), one column at a time, and at most `aio.CONCURRENCY` tables are
+    processed at a time unless an `asyncio.Semaphore` is given.  See
+    `infer_schema` for the other parameters.
+
+    Examples
+    --------
+    >>> async for entry in ainfer_columns(table):
+    ...     print(entry)
+    {"name": "A", "type": "integer"}
+    {"name": "B", "type": "string"}
+    """
+    return aio.infer_columns(
+        table,
+        tp.order_inferred_types(inferred_types),
+        max_sample,
+        cache,
+        sampling,
+        early_stop,
+        executor,
+        semaphore,
+    )
+
+
+async def ainfer_schema(
+    table,
+    inferred_types=None,
+    max_sample=MAX_SAMPLE,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    executor=None,
+    semaphore=None,
+):
+    """Coroutine returning the inferred schema for the given table, without
+    blocking the event loop.  Cancelling it stops between columns.  See
+    `ainfer_columns` and `infer_schema` for the parameters.
+
+    Examples
+    --------
+    >>> await ainfer_schema(table)
+    [
+        {"name": "A", "type": "integer"},
+        {"name": "B", "type": "string"}
+    ]
+    """
+    return await aio.infer_schema(
+        table,
+        tp.order_inferred_types(inferred_types),
+        max_sample,
+        cache,
+        sampling,
+        early_stop,
+        executor,
+        semaphore,
+    )
+
+
+def acast_batches(
+    table,
+    schema,
+    batch_size=aio.BATCH_SIZE,
+    report_formats=False,
+    cache=None,
+    executor=None,
+    semaphore=None,
+):
+    """Return an asynchronous iterator over tables of value objects for
+    successive batches of at most `batch_size` rows, each cast in the given
+    executor.  See `ainfer_columns` and `cast` for the other parameters.
+
+    Examples
+    --------
+    >>> async for batch in acast_batches(table, schema, batch_size=1):
+    ...     print(batch)
+    {"header": ["A", "B"], "rows": [[1, "foo"]]}
+    {"header": ["A", "B"], "rows": [[2, "bar"]]}
+    """
+    return aio.cast_batches(
+        table, schema, batch_size, report_formats, cache, executor, semaphore
+    )
+
+
+async def acast(
+    table,
+    schema,
+    batch_size=aio.BATCH_SIZE,
+    report_formats=False,
+    cache=None,
+    executor=None,
+    semaphore=None,
+):
+    """Coroutine returning a table of value objects given a table of literal
+    values and a schema, without blocking the event loop.  Cancelling it
+    stops between batches of rows.  See `acast_batches` for the parameters.
+
+    Examples
+    --------
+    >>> await acast(table, schema)
+    {"header": ["A", "B"], "rows": [[1, "foo"], [2, "bar"]]}
+    """
+    return await aio.cast(
+        table, schema, batch_size, report_formats, cache, executor, semaphore
+    )
+
+
+def to_rows(result):
+    """Return the row-oriented table of value objects for a table cast with
+    `layout="columns"`, expanding dictionary-encoded columns.
+
+    Examples
+    --------
+    >>> to_rows(cast(table, schema, layout="columns"))
+    {"header": ["A", "B"], "rows": [[1, "foo"], [2, "bar"]]}
+    """
+    return ly.to_rows(result)
+
 
+InferenceState = st.InferenceState
+LiteralCache = lc.LiteralCache
+SchemaCache = sc.SchemaCache
+WorkerPool = pl.WorkerPool
+parallel_session = pl.session
 
-cast_with_error = ec.error_catcher(cast)
-infer_schema_with_error = ec.error_catcher(infer_schema)
+__getattr__ = ec.with_error_getattr(globals(), {
+    "cast_with_error": "cast",
+    "infer_schema_with_error": "infer_schema",
+    "cast_from_path_with_error": "cast_from_path",
+    "infer_schema_from_path_with_error": "infer_schema_from_path",
+})
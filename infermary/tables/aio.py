@@ -0,0 +1,196 @@
+"""Library for schema inference and casting from asyncio code.
+
+Notes
+-----
+* The CPU work is handed to an executor in chunks, one column per inference
+  step and one batch of rows per casting step, so the event loop stays free
+  between chunks.  The executor defaults to the loop's default thread pool;
+  a process pool may be given as well.
+* Cancelling the awaiting task stops the submission of new chunks; a chunk
+  already running in the executor completes, and its result is discarded.
+* At most `CONCURRENCY` tables are processed at a time on each event loop,
+  unless the caller passes its own `asyncio.Semaphore`.
+* Column samples are read from the rows in the executor as well, so rows
+  given as a generator must not be consumed concurrently.  Batches of rows
+  to cast are read in the loop's default thread pool, since they must be
+  read in the calling process even if the executor is a process pool.
+* asyncio is only imported by the coroutines, whose callers already run an
+  event loop.
+"""
+
+from collections import Counter
+from functools import partial
+from itertools import islice
+import weakref
+
+from infermary.literals import cache as lc
+from infermary.tables import helpers as hp
+from infermary.tables.casting import cast as caster
+from infermary.tables.inferring import count as ct, infer as inferrer
+
+
+BATCH_SIZE = caster.BATCH_SIZE
+
+CONCURRENCY = 4
+
+_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore(semaphore):
+    """Return the given semaphore, or the default semaphore of the running
+    event loop.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    if semaphore is not None:
+        return semaphore
+    loop = asyncio.get_running_loop()
+    try:
+        return _SEMAPHORES[loop]
+    except KeyError:
+        return _SEMAPHORES.setdefault(loop, asyncio.Semaphore(CONCURRENCY))
+
+
+async def _run(executor, func, *args):
+    """Return the result of `func(*args)` computed in the executor."""
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args))
+
+
+def _sample_table(table, max_sample, sampling):
+    """Return the validated table header and its column samples."""
+    table = hp.validate_table(table)
+    samples = ct.sample_rows(
+        table["rows"], len(table["header"]), max_sample, sampling
+    )
+    return table["header"], [list(sample) for sample in samples]
+
+
+async def infer_columns(
+    table,
+    inferred_types,
+    max_sample,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    executor=None,
+    semaphore=None,
+):
+    """Yield the schema entry of each column of the table of string literals
+    as soon as it is inferred.
+    """
+    cache = lc.resolve_cache(cache)
+    async with _get_semaphore(semaphore):
+        header, samples = await _run(
+            executor, _sample_table, table, max_sample, sampling
+        )
+        for name, sample in zip(header, samples):
+            yield await _run(
+                executor, inferrer.infer_column, name, sample,
+                inferred_types, max_sample, cache, early_stop
+            )
+
+
+async def infer_schema(
+    table,
+    inferred_types,
+    max_sample,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    executor=None,
+    semaphore=None,
+):
+    """Return the inferred schema for the given table of string literals.
+    """
+    return [
+        entry async for entry in infer_columns(
+            table, inferred_types, max_sample, cache, sampling, early_stop,
+            executor, semaphore
+        )
+    ]
+
+
+def _read_batch(rows, batch_size):
+    """Return the list of the next (at most) `batch_size` rows."""
+    return list(islice(rows, batch_size))
+
+
+async def _cast_batches(
+    table, types, batch_size, report_formats, cache, executor, semaphore
+):
+    """Yield the cast tables of the batches of rows of the validated table.
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be a positive integer.")
+    rows = iter(table["rows"])
+    async with _get_semaphore(semaphore):
+        while True:
+            batch = await _run(None, _read_batch, rows, batch_size)
+            if not batch:
+                return
+            values, used = await _run(
+                executor, caster.cast_rows, batch, types, cache
+            )
+            result = {"header": table["header"], "rows": values}
+            if report_formats:
+                result["formats"] = [
+                    {"name": name, "formats": dict(col_used)}
+                    for name, col_used in zip(table["header"], used)
+                ]
+            yield result
+
+
+async def cast_batches(
+    table,
+    schema,
+    batch_size=BATCH_SIZE,
+    report_formats=False,
+    cache=None,
+    executor=None,
+    semaphore=None,
+):
+    """Yield tables of value objects for successive batches of at most
+    `batch_size` rows.  If `report_formats` is True, each batch holds the
+    counts of the formats used to cast its temporal columns.
+    """
+    table = await _run(None, hp.validate_table, table)
+    async for batch in _cast_batches(
+        table, [col["type"] for col in schema], batch_size, report_formats,
+        lc.resolve_cache(cache), executor, semaphore
+    ):
+        yield batch
+
+
+async def cast(
+    table,
+    schema,
+    batch_size=BATCH_SIZE,
+    report_formats=False,
+    cache=None,
+    executor=None,
+    semaphore=None,
+):
+    """Return a table of value objects given a table of literal values and a
+    schema, casting batches of rows in the executor.
+    """
+    table = await _run(None, hp.validate_table, table)
+    header = table["header"]
+    cast_rows = []
+    used = [Counter() for _ in header]
+    async for batch in _cast_batches(
+        table, [col["type"] for col in schema], batch_size, report_formats,
+        lc.resolve_cache(cache), executor, semaphore
+    ):
+        cast_rows.extend(batch["rows"])
+        for col_used, col in zip(used, batch.get("formats", ())):
+            col_used.update(col["formats"])
+    result = {"header": header, "rows": cast_rows}
+    if report_formats:
+        result["formats"] = [
+            {"name": name, "formats": dict(col_used)}
+            for name, col_used in zip(header, used)
+        ]
+    return result
@@ -1,51 +1,261 @@
 """Library for casting table literals."""
 
+from collections import Counter
 from functools import partial
-from itertools import starmap
+from itertools import islice
+import time
 
-from infermary.exceptions import CastError
-from infermary.literals import literal as lt
+from infermary import instrument as ins
 from infermary.tables import parallel as pl
+from infermary.tables.casting import column as cl, layout as ly, vector as vc
 
 
 CHUNKSIZE = 1000
 
+BATCH_SIZE = 10000
 
-def _cast_literal(literal, type_):
-    """Cast the given literal against the given type.  This function will
-    always return a value: the value object if casting succeeds, and None if
-    casting fails.
+TRANSPORTS = ("pickle", "shared")
+
+DICTIONARY = (False, True, "auto")
+
+# Largest fraction of distinct literals of the columns that the "auto"
+# dictionary encoding encodes.
+DICTIONARY_RATIO = 0.5
+
+
+def _cast_chunk(literals, type_, cache=None, vectorize=False):
+    """Cast a chunk of literals against the given type.  Return the list of
+    values and a Counter of the formats used (empty for non-temporal types).
+    If `vectorize` is True, supported types are cast with NumPy.
+    """
+    if vectorize and vc.supports(type_):
+        return vc.cast_column(literals, type_, cache), Counter()
+    caster = cl.ColumnCaster(type_, cache)
+    return list(map(caster, literals)), caster.used
+
+
+def _cast_encoded(literals, type_, cache=None, dictionary=True):
+    """Dictionary-encode the literals and cast each distinct literal once.
+    Return the `Encoded` values and a Counter of the formats used, or None
+    if `dictionary` is "auto" and the literals are not repeated enough.
     """
-    try:
-        return lt.cast(literal, type_)
-    except CastError:
+    max_distinct = None
+    if dictionary == "auto":
+        max_distinct = int(DICTIONARY_RATIO * len(literals))
+    encoded = ly.encode(literals, max_distinct)
+    if encoded is None:
         return None
+    codes, distinct, counts = encoded
+    caster = cl.ColumnCaster(type_, cache)
+    values = list(map(caster, distinct, counts))
+    return ly.Encoded(codes, values), caster.used
+
+
+def _chunk(literals, chunksize):
+    """Split the sequence of literals into chunks of the given size."""
+    return [
+        literals[i:i + chunksize] for i in range(0, len(literals), chunksize)
+    ]
 
 
-def _cast_literals(literals, type_, parallel, chunksize=CHUNKSIZE):
-    """Cast each element of the iterable of literals against the given type.
+def _cast_literals(
+    literals,
+    type_,
+    parallel,
+    chunksize=CHUNKSIZE,
+    cache=None,
+    vectorize=False,
+    dictionary=False,
+):
+    """Cast each element of the sequence of literals against the given type.
+    Return the list (or `Encoded`) of values and a Counter of the formats
+    used.
     """
-    mapper = pl.map_par(pl.Pool, chunksize=chunksize) if parallel else map
-    return mapper(partial(_cast_literal, type_=type_), literals)
+    if dictionary:
+        result = _cast_encoded(literals, type_, cache, dictionary)
+        if result is not None:
+            return result
+    cast_chunk = partial(
+        _cast_chunk, type_=type_, cache=cache, vectorize=vectorize
+    )
+    if not parallel:
+        return cast_chunk(literals)
+    values = []
+    used = Counter()
+    mapper = pl.map_par(pl.pool_class())
+    for chunk_values, chunk_used in mapper(
+        cast_chunk, _chunk(literals, chunksize)
+    ):
+        values.extend(chunk_values)
+        used.update(chunk_used)
+    return values, used
 
 
-def _cast_columns(columns, types, parallel):
+def _cast_columns(
+    columns, types, parallel, cache=None, vectorize=False, dictionary=False
+):
     """Return a list of cast columns for the given list of column types.
     """
-    mapper = (
-        pl.map_par(pl.NDPool, map_method="starmap") if parallel else starmap
-    )
+    mapper = pl.column_mapper(parallel, map_method="starmap")
     return mapper(
-        partial(_cast_literals, parallel=parallel), zip(columns, types)
+        partial(
+            _cast_literals,
+            parallel=pl.column_parallel(parallel),
+            cache=cache,
+            vectorize=vectorize,
+            dictionary=dictionary,
+        ),
+        zip(columns, types)
     )
 
 
-def cast(table, schema, parallel):
+def cast_rows(rows, types, cache=None):
+    """Cast an iterable of rows one row at a time, without transposing.
+    Return the list of cast rows and the list of per-column format Counters.
+    """
+    column_casters = [cl.ColumnCaster(type_, cache) for type_ in types]
+    values = [
+        [caster(literal) for caster, literal in zip(column_casters, row)]
+        for row in rows
+    ]
+    return values, [caster.used for caster in column_casters]
+
+
+def cast(
+    table,
+    schema,
+    parallel,
+    report_formats=False,
+    cache=None,
+    transport="pickle",
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
     """Return a table of value objects given a table of literal values and a
-    schema.
+    schema.  If `report_formats` is True, the result also holds the counts of
+    the formats used to cast each temporal column.  If a `LiteralCache` is
+    given, repeated literals are cast only once.  The rows may be any
+    iterable; serial casting consumes them one row at a time.  In parallel,
+    the "shared" `transport` passes the columns to the workers through
+    shared memory instead of pickling them.  With the "numpy" (or "auto")
+    `engine`, supported columns are cast as NumPy batch operations, which
+    requires transposing the rows in serial as well.  With the "columns"
+    `layout`, the cast columns are returned as typed containers with validity
+    bitmaps (see `layout`) instead of being transposed back into rows.  With
+    `dictionary` True (or "auto", for the columns with at most
+    `DICTIONARY_RATIO` distinct literals), columns are dictionary-encoded,
+    casting each distinct literal once; encoded columns are passed by
+    pickling and kept encoded in the "columns" layout.
     """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}'.")
+    if layout not in ly.LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'.")
+    if dictionary not in DICTIONARY:
+        raise ValueError(f"Unknown dictionary encoding '{dictionary}'.")
+    start = time.perf_counter()
     types = [col["type"] for col in schema]
-    columns = zip(*table["rows"])
-    cast_columns = _cast_columns(columns, types, parallel)
-    cast_rows = list(map(list, zip(*cast_columns)))
-    return {"header": table["header"], "rows": cast_rows}
+    parallel_ = pl.is_parallel(parallel)
+    vectorize = vc.resolve_engine(engine) and any(map(vc.supports, types))
+    if parallel_ or vectorize or dictionary or layout == "columns":
+        columns = zip(*table["rows"])
+        if transport == "shared" and parallel_ and not dictionary:
+            # Imported on first use, see README "Cold Starts".
+            # pylint: disable=import-outside-toplevel
+            from infermary.tables.casting import shared as sh
+
+            cast_columns = sh.cast_columns(
+                columns, types, parallel, cache, vectorize=vectorize
+            )
+        else:
+            cast_columns = list(_cast_columns(
+                columns, types, parallel, cache, vectorize, dictionary
+            ))
+        values = [vals for vals, _ in cast_columns]
+        used = [used for _, used in cast_columns]
+        if layout == "columns":
+            result = ly.pack_columns(table["header"], types, values)
+        else:
+            result = {
+                "header": table["header"],
+                "rows": list(map(list, zip(*map(ly.expand, values)))),
+            }
+    else:
+        values, used = cast_rows(table["rows"], types, cache)
+        result = {"header": table["header"], "rows": values}
+    if report_formats:
+        result["formats"] = [
+            {"name": name, "formats": dict(col_used)}
+            for name, col_used in zip(table["header"], used)
+        ]
+    if ins.ACTIVE is not None:
+        ins.ACTIVE.record_cast(
+            time.perf_counter() - start,
+            result["length"] if layout == "columns" else len(result["rows"]),
+            len(types),
+        )
+    return result
+
+
+def _batches(rows, batch_size):
+    """Lazily yield lists of at most `batch_size` successive rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _cast_batch(rows, header, schema, **kwargs):
+    """Return the cast table of a batch of rows, cast serially."""
+    return cast({"header": header, "rows": rows}, schema, False, **kwargs)
+
+
+def cast_iter(
+    table,
+    schema,
+    batch_size=BATCH_SIZE,
+    parallel=False,
+    max_in_flight=None,
+    report_formats=False,
+    cache=None,
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
+    """Return an iterator over the cast tables of successive batches of at
+    most `batch_size` rows, read lazily from the table rows.  In parallel,
+    batches are cast by the pool or backend of `parallel` (each one
+    serially) and yielded in order, with at most `max_in_flight` batches
+    read ahead of the consumer (see `parallel.imap_bounded`).  See `cast`
+    for the other parameters, which apply to each batch.
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be a positive integer.")
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("The number of batches in flight must be positive.")
+    if layout not in ly.LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'.")
+    if dictionary not in DICTIONARY:
+        raise ValueError(f"Unknown dictionary encoding '{dictionary}'.")
+    vc.resolve_engine(engine)
+    # Raises a ValueError for an unknown backend before any batch is read.
+    pl.get_backend(parallel)
+    cast_batch = partial(
+        _cast_batch,
+        header=table["header"],
+        schema=schema,
+        report_formats=report_formats,
+        cache=cache,
+        engine=engine,
+        layout=layout,
+        dictionary=dictionary,
+    )
+    return pl.imap_bounded(
+        parallel,
+        cast_batch,
+        _batches(table["rows"], batch_size),
+        max_in_flight,
+    )
@@ -0,0 +1,58 @@
+"""Library for casting the successive literals of a table column."""
+
+from collections import Counter
+
+from infermary import instrument as ins
+from infermary.literals import literal as lt, helpers as lhp
+from infermary.literals.casting import casters, temporal as tm
+
+
+def _cast_literal(literal, type_, cache=None):
+    """Cast the given literal against the given type.  This function will
+    always return a value: the value object if casting succeeds, and None if
+    casting fails.
+    """
+    if cache is None:
+        value = lt.try_cast(literal, type_)
+    else:
+        value = cache.try_cast(literal, type_)
+    return None if value is lt.FAILED else value
+
+
+class ColumnCaster:
+    """Callable that casts the successive literals of one column against the
+    given type, returning None for failed casts.  For temporal types, the
+    format that last succeeded is attempted first, falling back to the full
+    ordered format list on a miss, and the formats used are counted in
+    `used`, each call adding its `weight` (e.g. the number of cells holding
+    a distinct literal).
+    """
+
+    def __init__(self, type_, cache=None):
+        self.type_ = type_
+        self.cache = cache
+        self.used = Counter()
+        self._pinned = None
+        self._temporal = casters.TEMPORAL.get(type_)
+        if self._temporal is not None:
+            self._plan = tm.get_plan(self._temporal[0])
+            self._find = self._plan.find
+            if ins.ACTIVE is not None:
+                self._find = ins.ACTIVE.timed_find(type_, self._find)
+
+    def __call__(self, literal, weight=1):
+        if self._temporal is None:
+            return _cast_literal(literal, self.type_, self.cache)
+        lit = lhp.check_and_prepare_literal(literal)
+        if self.cache is None:
+            found = self._find(lit, self._pinned)
+        else:
+            found = self.cache.memoize(
+                ("match", lit, self.type_),
+                self._find, lit, self._pinned
+            )
+        if found is None:
+            return None
+        value, self._pinned = found
+        self.used[self._pinned.format] += weight
+        return self._temporal[1](value)
@@ -0,0 +1,191 @@
+"""Library for packing cast table columns into compact typed containers.
+
+Notes
+-----
+* A columnar table has the form
+  {
+      "header": [column header names],
+      "length": number of rows,
+      "columns": [
+          {"name": name, "type": type, "values": values, "validity": bitmap},
+          ...
+      ]
+  }
+* Integer columns are packed into `array("q")`, float, number, percent, and
+  currency columns into `array("d")`, and boolean columns into `bytes` of 0
+  and 1.  Columns whose values do not fit (e.g. integers beyond 64 bits)
+  and columns of other types are kept as lists.
+* Missing and failed cells hold 0 (or None in lists) and are marked by a
+  cleared bit in the validity bitmap: bit `i % 8` of byte `i // 8` is set if
+  the value of row `i` is valid.
+* A dictionary-encoded column holds, instead of `values`, the list of
+  values of its distinct literals in order of first appearance as
+  `dictionary`, and the index of the value of each row as `codes`, packed
+  into the smallest unsigned array typecode that fits.  Its cells that hold
+  None in the dictionary are marked invalid.
+"""
+
+from array import array
+from collections import Counter, namedtuple
+
+
+LAYOUTS = ("rows", "columns")
+
+# Dictionary-encoded column values.
+Encoded = namedtuple("Encoded", ["codes", "dictionary"])
+
+# Unsigned array typecodes by increasing size (1, 2, 4, and 8 bytes on
+# common platforms), with the number of codes they can hold.
+CODE_TYPECODES = [
+    (typecode, 1 << 8 * array(typecode).itemsize) for typecode in "BHI"
+]
+
+TYPECODES = {
+    "integer": "q",
+    "float": "d",
+    "number": "d",
+    "percent": "d",
+    "currency": "d",
+}
+
+
+def validity_bitmap(values):
+    """Return the validity bitmap of the list of values."""
+    bits = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is not None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def code_typecode(size):
+    """Return the smallest array typecode for the codes of a dictionary of
+    the given size.
+    """
+    for typecode, limit in CODE_TYPECODES:
+        if size <= limit:
+            return typecode
+    return "Q"
+
+
+def encode(literals, max_distinct=None):
+    """Return a tuple (codes, distinct literals, counts) for the sequence of
+    literals, where `codes` holds the index of the distinct literal of each
+    row and `counts` the number of rows of each distinct literal.  Return
+    None if there are more than `max_distinct` distinct literals.
+    """
+    counter = Counter(literals)
+    if max_distinct is not None and len(counter) > max_distinct:
+        return None
+    index = {literal: code for code, literal in enumerate(counter)}
+    codes = array(code_typecode(len(index)), map(index.__getitem__, literals))
+    return codes, list(counter), list(counter.values())
+
+
+def expand(values):
+    """Return the list of values of a column, expanding `Encoded` values."""
+    if isinstance(values, Encoded):
+        return list(map(values.dictionary.__getitem__, values.codes))
+    return values
+
+
+def _code_validity(codes, dictionary):
+    """Return the validity bitmap of dictionary-encoded values."""
+    invalid = {code for code, value in enumerate(dictionary) if value is None}
+    bits = bytearray((len(codes) + 7) // 8)
+    for i, code in enumerate(codes):
+        if code not in invalid:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def is_valid(bitmap, index):
+    """Return True if the validity bitmap marks the given row as valid."""
+    return bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+
+def _typed(values, type_):
+    """Return the compact container of the column values, or the list itself
+    if the type has none or a value does not fit.
+    """
+    if type_ == "boolean":
+        if all(value is None or type(value) is bool for value in values):
+            return bytes(value is True for value in values)
+        return values
+    typecode = TYPECODES.get(type_)
+    if typecode is None:
+        return values
+    try:
+        return array(
+            typecode, [0 if value is None else value for value in values]
+        )
+    except (OverflowError, TypeError):
+        return values
+
+
+def _pack(name, type_, values):
+    """Return the packed column for the list (or `Encoded`) of values."""
+    if isinstance(values, Encoded):
+        return {
+            "name": name,
+            "type": type_,
+            "codes": values.codes,
+            "dictionary": values.dictionary,
+            "validity": _code_validity(values.codes, values.dictionary),
+        }
+    return {
+        "name": name,
+        "type": type_,
+        "values": _typed(values, type_),
+        "validity": validity_bitmap(values),
+    }
+
+
+def pack_columns(header, types, columns):
+    """Return a columnar table for the header, column types, and lists (or
+    `Encoded`) of cast column values.
+    """
+    length = 0
+    if columns:
+        first = columns[0]
+        length = len(first.codes if isinstance(first, Encoded) else first)
+    return {
+        "header": header,
+        "length": length,
+        "columns": [
+            _pack(name, type_, values)
+            for name, type_, values in zip(header, types, columns)
+        ],
+    }
+
+
+def column_values(column, length):
+    """Return the list of value objects of a packed column, with None for
+    invalid cells.
+    """
+    if "codes" in column:
+        return expand(Encoded(column["codes"], column["dictionary"]))
+    values = column["values"]
+    if isinstance(values, list):
+        return values
+    convert = bool if column["type"] == "boolean" else None
+    return [
+        (convert(value) if convert else value)
+        if is_valid(column["validity"], i) else None
+        for i, value in zip(range(length), values)
+    ]
+
+
+def to_rows(result):
+    """Return the row-oriented table for a columnar table."""
+    columns = [
+        column_values(column, result["length"])
+        for column in result["columns"]
+    ]
+    rows = {
+        "header": result["header"],
+        "rows": [list(row) for row in zip(*columns)],
+    }
+    if "formats" in result:
+        rows["formats"] = result["formats"]
+    return rows
@@ -0,0 +1,219 @@
+"""Library for process-parallel casting of table columns through shared
+memory.
+
+Notes
+-----
+* Each column is written once to a shared memory block that holds the
+  offsets of its UTF-8 encoded (stripped) literals, the encoded data, and
+  room for typed results:
+
+    [offsets: int64 * (n + 1)][data][values: 8 bytes * n][validity: n bytes]
+
+* Workers only receive small block descriptors (block name, layout, type,
+  and row range).  For integer, float, number, percent, currency, and
+  boolean columns, workers write the cast values and validity flags back
+  into the block; other types (or values that do not fit the typed layout,
+  such as integers beyond 64 bits) are returned by pickling as usual.
+* Ranges of the same column are written by different workers, but never
+  overlap, so no locking is needed.
+"""
+
+from array import array
+from collections import Counter, namedtuple
+from multiprocessing.shared_memory import SharedMemory
+
+from infermary.literals import helpers as lhp
+from infermary.tables import parallel as pl
+from infermary.tables.casting import column as cl, vector as vc
+
+
+BLOCKSIZE = 10000
+
+ENCODING = "utf-8"
+
+ERRORS = "surrogatepass"
+
+# Typecode and exact Python type of the values written back by workers.
+TYPED = {
+    "integer": ("q", int),
+    "boolean": ("q", bool),
+    "float": ("d", float),
+    "number": ("d", float),
+    "percent": ("d", float),
+    "currency": ("d", float),
+}
+
+Layout = namedtuple(
+    "Layout", ["length", "data_offset", "values_offset", "validity_offset"]
+)
+
+Block = namedtuple(
+    "Block",
+    ["name", "layout", "type_", "start", "stop", "cache", "vectorize"],
+)
+
+
+def _layout(length, nbytes):
+    """Return the layout of a column block of the given number of literals
+    and encoded bytes.
+    """
+    data_offset = 8 * (length + 1)
+    values_offset = -(-(data_offset + nbytes) // 8) * 8
+    validity_offset = values_offset + 8 * length
+    return Layout(length, data_offset, values_offset, validity_offset)
+
+
+def _write_column(literals):
+    """Return a new shared memory block holding the encoded literals of a
+    column, and its layout.
+    """
+    encoded = [
+        lhp.check_and_prepare_literal(literal).encode(ENCODING, ERRORS)
+        for literal in literals
+    ]
+    offsets = array("q", [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    layout = _layout(len(encoded), total)
+    shm = SharedMemory(
+        create=True, size=layout.validity_offset + layout.length
+    )
+    shm.buf[:layout.data_offset] = offsets.tobytes()
+    data = b"".join(encoded)
+    shm.buf[layout.data_offset:layout.data_offset + total] = data
+    return shm, layout
+
+
+def _read_literals(buf, block):
+    """Return the decoded literals of the block range."""
+    layout = block.layout
+    with buf[:layout.data_offset].cast("q") as offsets:
+        return [
+            bytes(
+                buf[layout.data_offset + offsets[i]:
+                    layout.data_offset + offsets[i + 1]]
+            ).decode(ENCODING, ERRORS)
+            for i in range(block.start, block.stop)
+        ]
+
+
+def _write_values(buf, block, values):
+    """Write the typed values and validity flags of the block range.  Return
+    False, without writing, if a value does not fit the typed layout.
+    """
+    typecode, value_type = TYPED[block.type_]
+    typed = array(typecode)
+    validity = bytearray(len(values))
+    for i, value in enumerate(values):
+        if value is None:
+            typed.append(0)
+            continue
+        # Exact type check: bool is a subclass of int.
+        if type(value) is not value_type:  # pylint: disable=C0123
+            return False
+        try:
+            typed.append(value)
+        except OverflowError:
+            return False
+        validity[i] = 1
+    layout = block.layout
+    start = layout.values_offset + 8 * block.start
+    buf[start:start + 8 * len(values)] = typed.tobytes()
+    start = layout.validity_offset + block.start
+    buf[start:start + len(values)] = validity
+    return True
+
+
+def _cast_block(block):
+    """Cast the literals of a block range in a worker.  Return the list of
+    values (None if they were written to the block) and the Counter of
+    formats used.
+    """
+    shm = SharedMemory(name=block.name)
+    try:
+        literals = _read_literals(shm.buf, block)
+        if block.vectorize and vc.supports(block.type_):
+            values = vc.cast_column(literals, block.type_, block.cache)
+            used = Counter()
+        else:
+            caster = cl.ColumnCaster(block.type_, block.cache)
+            values = list(map(caster, literals))
+            used = caster.used
+        if block.type_ in TYPED and _write_values(shm.buf, block, values):
+            values = None
+    finally:
+        shm.close()
+    return values, used
+
+
+def _read_values(buf, block):
+    """Return the list of typed values of the block range."""
+    typecode, value_type = TYPED[block.type_]
+    layout = block.layout
+    start = layout.values_offset + 8 * block.start
+    stop = layout.values_offset + 8 * block.stop
+    with buf[start:stop].cast(typecode) as typed:
+        validity = bytes(
+            buf[layout.validity_offset + block.start:
+                layout.validity_offset + block.stop]
+        )
+        return [
+            value_type(value) if valid else None
+            for value, valid in zip(typed, validity)
+        ]
+
+
+def _column_blocks(shm, layout, type_, cache, blocksize, vectorize=False):
+    """Return the block descriptors of a column."""
+    return [
+        Block(shm.name, layout, type_, start,
+              min(start + blocksize, layout.length), cache, vectorize)
+        for start in range(0, layout.length, blocksize)
+    ]
+
+
+def cast_columns(
+    columns,
+    types,
+    parallel,
+    cache=None,
+    blocksize=BLOCKSIZE,
+    vectorize=False,
+):
+    """Return a list of (values, format Counter) pairs for the given columns
+    and types, casting blocks of each column in parallel workers (with NumPy
+    for supported types if `vectorize` is True).
+    """
+    shms = []
+    try:
+        column_blocks = []
+        for column, type_ in zip(columns, types):
+            shm, layout = _write_column(column)
+            shms.append(shm)
+            column_blocks.append(
+                _column_blocks(
+                    shm, layout, type_, cache, blocksize, vectorize
+                )
+            )
+        results = iter(pl.task_mapper(parallel)(
+            _cast_block,
+            [block for blocks in column_blocks for block in blocks],
+        ))
+        cast_columns_ = []
+        for shm, blocks in zip(shms, column_blocks):
+            column_values = []
+            column_used = Counter()
+            for block in blocks:
+                values, used = next(results)
+                if values is None:
+                    values = _read_values(shm.buf, block)
+                column_values.extend(values)
+                column_used.update(used)
+            cast_columns_.append((column_values, column_used))
+        return cast_columns_
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
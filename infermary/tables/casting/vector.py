@@ -0,0 +1,175 @@
+"""Library for vectorized casting of missing, integer, float, number, and
+boolean columns with NumPy, which is an optional dependency.
+
+Notes
+-----
+* A column is converted once to a NumPy string array and stripped.  Cells
+  whose outcome is decided by plain decimal literals (an optional "-", ASCII
+  digits, at most one ".") or by the boolean sentinels are cast as batch
+  operations; every other cell is located with a mask and cast by the scalar
+  casters, so the values are identical to `literal.cast` (with None for
+  failed casts).
+* Plain integers are converted exactly, like `to_integer`, and only up to
+  `INTEGER_DIGITS` digits so that they fit an int64.  Literals with a
+  non-numeric leading zero, commas, exponents, signs other than a single "-",
+  or non-ASCII digits fall back to the scalar casters.
+* NumPy strings drop trailing NUL characters and ignore them in
+  comparisons; cells with NUL characters also fall back.
+* NumPy is imported on the first use of a vectorizing engine.
+"""
+
+from itertools import compress, repeat
+
+from infermary.literals.casting import formats as fmt
+from infermary.tables.casting import column as cl
+
+_UNLOADED = object()
+
+# The NumPy module, or None if it is not installed.
+np = _UNLOADED
+
+
+VECTOR_TYPES = frozenset(["missing", "integer", "float", "number", "boolean"])
+
+ENGINES = ("python", "numpy", "auto")
+
+INTEGER_DIGITS = 18
+
+_DIGITS = "0123456789"
+
+
+def _numpy():
+    """Return the NumPy module, importing it on first use, or None if it is
+    not installed.
+    """
+    global np  # pylint: disable=global-statement
+    if np is _UNLOADED:
+        try:
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError:  # pragma: no cover
+            numpy = None
+        np = numpy
+    return np
+
+
+def resolve_engine(engine):
+    """Return True if the given casting engine vectorizes columns.  An
+    ImportError is raised if the "numpy" engine is requested without NumPy,
+    and a ValueError for an unknown engine.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown casting engine '{engine}'.  Use one of {list(ENGINES)}."
+        )
+    if engine == "python":
+        return False
+    if engine == "numpy" and _numpy() is None:
+        raise ImportError("The 'numpy' casting engine requires NumPy.")
+    return _numpy() is not None
+
+
+def supports(type_):
+    """Return True if columns of the given type can be cast vectorized."""
+    return type_ in VECTOR_TYPES and _numpy() is not None
+
+
+def _prepare(literals):
+    """Return the array of stripped literals and the mask of cells without
+    NUL characters, which NumPy strings do not preserve.
+    """
+    nul = np.fromiter(
+        map(str.__contains__, literals, repeat("\x00")),
+        dtype=bool, count=len(literals),
+    )
+    return np.char.strip(np.array(literals, dtype=str)), ~nul
+
+
+def _plain_numbers(stripped):
+    """Return the mask of plain decimal literals without a non-numeric
+    leading zero, the mask of those with a decimal point, and the number of
+    digits of each literal.
+    """
+    lengths = np.char.str_len(stripped)
+    body = np.char.lstrip(stripped, "-")
+    digits = np.char.replace(body, ".", "", 1)
+    num_digits = np.char.str_len(digits)
+    has_dot = num_digits < np.char.str_len(body)
+    dot = np.char.find(stripped, ".")
+    whole = np.where(dot >= 0, dot, lengths)
+    leading_zero = np.char.startswith(stripped, "0") & (whole > 1)
+    plain = (
+        (lengths - np.char.str_len(body) <= 1)
+        & (num_digits > 0)
+        & (np.char.strip(digits, _DIGITS) == "")
+        & ~leading_zero
+    )
+    return plain, has_dot, num_digits
+
+
+def _to_float64(literals, cells):
+    """Return the float64 array of the plain decimal literals selected by the
+    mask.  The literals are stripped first, since `float` does not ignore
+    all the characters removed by `str.strip` (e.g. "\x1c"); this is still
+    faster than NumPy's string conversion.
+    """
+    return np.fromiter(
+        map(float, map(str.strip, compress(literals, cells))),
+        dtype=np.float64, count=np.count_nonzero(cells),
+    )
+
+
+def _to_int64(literals, cells):
+    """Return the int64 array of the plain integer literals selected by the
+    mask, stripped and converted exactly by `int`.
+    """
+    return np.fromiter(
+        map(int, map(str.strip, compress(literals, cells))),
+        dtype=np.int64, count=np.count_nonzero(cells),
+    )
+
+
+def cast_column(literals, type_, cache=None):
+    """Return the list of values of the column literals cast against the
+    given vectorizable type, with None for failed casts.
+    """
+    literals = list(literals)
+    if not literals or not all(map(isinstance, literals, repeat(str))):
+        # Empty columns and non-string literals (which raise) stay scalar.
+        return [cl._cast_literal(lit, type_, cache) for lit in literals]
+    stripped, exact = _prepare(literals)
+    values = np.full(len(literals), None, dtype=object)
+    if type_ == "missing":
+        return values.tolist()
+    if type_ == "boolean":
+        true = np.isin(stripped, fmt.TRUE)
+        values[true] = True
+        values[np.isin(stripped, fmt.FALSE)] = False
+        decided = exact
+    else:
+        plain, has_dot, num_digits = _plain_numbers(stripped)
+        plain &= exact
+        if type_ == "integer":
+            cells = plain & ~has_dot & (num_digits <= INTEGER_DIGITS)
+            # Plain literals with a decimal point are not integers.
+            decided = cells | (plain & has_dot)
+        elif type_ == "float":
+            cells = plain & has_dot
+            # Plain literals without a decimal point or exponent are not
+            # floats.
+            decided = plain
+        else:
+            cells = plain
+            decided = plain
+        if type_ == "integer":
+            converted = _to_int64(literals, cells)
+        else:
+            converted = _to_float64(literals, cells)
+        values[cells] = converted
+        # Missing sentinels that fail the scalar cast (e.g. "" or "null").
+        decided |= exact & np.isin(stripped, [
+            lit for lit in fmt.MISSING
+            if cl._cast_literal(lit, type_) is None
+        ])
+    for i in np.flatnonzero(~decided):
+        values[i] = cl._cast_literal(literals[i], type_, cache)
+    return values.tolist()
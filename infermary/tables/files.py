@@ -0,0 +1,116 @@
+"""Library for reading delimited text files as tables of string literals.
+
+Notes
+-----
+* Rows are read lazily through a buffered reader, so schema inference stops
+  reading as soon as every column sample is full.
+* Gzip-compressed files are detected by their magic bytes and decompressed
+  transparently.
+* Random-offset sampling memory-maps the (uncompressed) file, jumps to random
+  byte offsets, skips to the next line break, and parses a few rows from
+  there.  Rows whose length does not match the header (e.g. when an offset
+  falls inside a quoted field with line breaks) are dropped.  The encoding
+  must be ASCII-compatible for the line breaks to be found.
+"""
+
+from contextlib import contextmanager
+import csv
+import gzip
+import io
+from itertools import chain, islice
+import mmap
+import os
+import random
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+BUFFER_SIZE = 1 << 20
+
+OFFSET_ROWS = 10
+
+
+def is_gzip(path):
+    """Return True if the file at the given path is gzip-compressed."""
+    with open(path, "rb") as fobj:
+        return fobj.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+
+def open_text(path, encoding="utf-8"):
+    """Return a buffered text file object for the given path, decompressing
+    gzip files transparently.
+    """
+    if is_gzip(path):
+        return gzip.open(path, "rt", encoding=encoding, newline="")
+    return open(
+        path, "r", encoding=encoding, newline="", buffering=BUFFER_SIZE
+    )
+
+
+def _offset_rows(
+    path, random_offsets, offset_rows, seed, delimiter, encoding
+):
+    """Yield up to `offset_rows` rows from each of `random_offsets` random
+    byte offsets of the memory-mapped file, in file order.
+    """
+    with open(path, "rb") as fobj:
+        size = os.fstat(fobj.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            rng = random.Random(seed)
+            offsets = sorted(
+                rng.randrange(size) for _ in range(random_offsets)
+            )
+            for offset in offsets:
+                start = mapped.find(b"\n", offset) + 1
+                if not start:
+                    continue
+                end = start
+                for _ in range(offset_rows):
+                    end = mapped.find(b"\n", end) + 1
+                    if not end:
+                        end = size
+                        break
+                text = mapped[start:end].decode(encoding, errors="replace")
+                yield from csv.reader(io.StringIO(text), delimiter=delimiter)
+
+
+@contextmanager
+def open_table(
+    path,
+    delimiter=",",
+    encoding="utf-8",
+    head_rows=None,
+    random_offsets=0,
+    offset_rows=OFFSET_ROWS,
+    seed=None,
+):
+    """Context manager that yields a table whose header is the first line of
+    the delimited file and whose rows are read lazily.  If `head_rows` is
+    given, only that many rows are read from the head of the file.  If
+    `random_offsets` is positive, the head rows are followed by rows read at
+    random offsets of the file.
+    """
+    if random_offsets and is_gzip(path):
+        raise ValueError(
+            "Random-offset sampling requires an uncompressed file."
+        )
+    fobj = open_text(path, encoding)
+    offsets = None
+    try:
+        reader = csv.reader(fobj, delimiter=delimiter)
+        header = next(reader, [])
+        rows = reader if head_rows is None else islice(reader, head_rows)
+        if random_offsets:
+            offsets = _offset_rows(
+                path, random_offsets, offset_rows, seed, delimiter, encoding
+            )
+            rows = chain(
+                rows, (row for row in offsets if len(row) == len(header))
+            )
+        yield {"header": header, "rows": rows}
+    finally:
+        if offsets is not None:
+            offsets.close()
+        fobj.close()
@@ -1,12 +1,16 @@
 """Helper functions for casting and schema inference of literal tabular data.
 """
 
+from itertools import chain
+
 from infermary.exceptions import TableFormatError
 
 
 def validate_table(table):
     """Return the table data if validation passes; otherwise, raise an
-    exception.
+    exception.  The rows may be a list or any other iterable of rows (e.g. a
+    generator); in the latter case, the first row is read for validation and
+    a table with a chained row iterator is returned.
 
     Notes
     -----
@@ -17,13 +21,20 @@ def validate_table(table):
         header = table["header"]
         rows = table["rows"]
         assert isinstance(header, list)
-        assert isinstance(rows, list)
-        assert len(rows[0]) == len(header)
+        assert not isinstance(rows, (str, bytes, dict))
+        if isinstance(rows, list):
+            first = rows[0]
+        else:
+            rows = iter(rows)
+            first = next(rows)
+            table = dict(table, rows=chain([first], rows))
+        assert len(first) == len(header)
     except Exception:
         raise TableFormatError(
             "The input does not match the accepted table format. The input "
             "object must be a dictionary with a `header` field that is a "
             "list of the column names, and a `rows` field that is a list of "
-            "row data.  The length of each row must match the header length."
+            "row data (or an iterable of rows).  The length of each row must "
+            "match the header length."
         )
     return table
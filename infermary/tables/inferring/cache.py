@@ -0,0 +1,192 @@
+"""Module holding a cache of inferred schemas for tables that share a layout.
+
+Notes
+-----
+* Schemas are keyed by the header, the ordered inferred types, the sampling
+  parameters, and a fingerprint of the first `SAMPLE_ROWS` rows: for each
+  column, the set of shapes of its stripped literals (see
+  `literals.shapes.shape`, which keeps the lengths and a "0" starting a run
+  of digits, e.g. "2017-10-13" becomes "9999-99-99").
+* A cached schema is only returned if, in each column, the cached type still
+  casts most of the non-missing literals of the sample rows (like the vote,
+  which tolerates a few literals of other types) and no earlier inferred
+  type wins the vote of those literals; otherwise the lookup counts as
+  rejected and the schema is inferred again.  A hit may thus differ from a
+  full inference on rows past the sample.
+* Entries are kept in memory in least-recently-used order, and optionally
+  stored as JSON files in a directory shared across processes and runs.
+"""
+
+from collections import Counter, OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+
+from infermary.exceptions import FatalCastError
+from infermary.literals import literal as lt, shapes as sh
+from infermary.tables.inferring import vote as vt
+
+
+DEFAULT_MAXSIZE = 256
+
+SAMPLE_ROWS = 20
+
+
+def shape(literal):
+    """Return the shape of the stripped literal, e.g. "aa99-999" for
+    "ab12-345".
+    """
+    return sh.shape(literal.strip())
+
+
+def fingerprint(sample):
+    """Return the list of sorted literal shapes of each column of the sample
+    rows.
+    """
+    return [sorted(set(map(shape, column))) for column in zip(*sample)]
+
+
+def _preempted(type_, literals, inferred_types):
+    """Return True if a type before the given one in the ordered inferred
+    types wins the vote of the literals.
+    """
+    if type_ not in inferred_types:
+        return False
+    earlier = inferred_types[:inferred_types.index(type_)]
+    counter = Counter()
+    for literal in literals:
+        try:
+            counter[lt.infer_type(literal, inferred_types)] += 1
+        except FatalCastError:
+            continue
+    return vt.vote(counter) in earlier
+
+
+def _verify(schema, sample, inferred_types=None):
+    """Return True if, for each column, the schema type casts most of the
+    non-missing literals of the sample rows, as required by the vote, and
+    (if the ordered inferred types are given) no earlier type wins the vote
+    of those literals.  Rows shorter than the schema fail the verification.
+    """
+    if any(len(row) < len(schema) for row in sample):
+        return False
+    for index, col in enumerate(schema):
+        balance = 0
+        literals = []
+        for row in sample:
+            literal = row[index]
+            if lt.try_cast(literal, "missing") is not lt.FAILED:
+                continue
+            literals.append(literal)
+            if lt.try_cast(literal, col["type"]) is lt.FAILED:
+                balance -= 1
+            else:
+                balance += 1
+        if balance < 0:
+            return False
+        if inferred_types is not None and _preempted(
+            col["type"], literals, list(inferred_types)
+        ):
+            return False
+    return True
+
+
+class SchemaCache:
+    """Size-bounded LRU cache of inferred schemas, optionally backed by a
+    directory of JSON files, with hit, miss, and rejection counters.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, path=None):
+        if maxsize < 1:
+            raise ValueError("The cache size must be a positive integer.")
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.rejections = 0
+        self._data = OrderedDict()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def key(header, inferred_types, sample, parameters=()):
+        """Return the key of a table given its header, ordered inferred
+        types, sample rows, and other inference parameters.
+        """
+        text = json.dumps(
+            [header, inferred_types, list(parameters), fingerprint(sample)]
+        )
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def _remember(self, key, schema):
+        self._data[key] = schema
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _load(self, key):
+        """Return the schema stored on disk for the key, or None."""
+        if self.path is None:
+            return None
+        try:
+            with open(self._file(key), encoding="utf-8") as fobj:
+                return json.load(fobj)["schema"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def lookup(self, key, sample, inferred_types=None):
+        """Return a copy of the cached schema for the key if the sample rows
+        cast under it (and, given the ordered inferred types, no earlier type
+        wins their vote), or None.
+        """
+        schema = self._data.get(key)
+        if schema is None:
+            schema = self._load(key)
+        if schema is None:
+            self.misses += 1
+            return None
+        if not _verify(schema, sample, inferred_types):
+            self.rejections += 1
+            return None
+        self._remember(key, schema)
+        self.hits += 1
+        return [dict(col) for col in schema]
+
+    def store(self, key, schema):
+        """Cache the schema for the key, in memory and on disk."""
+        schema = [dict(col) for col in schema]
+        self._remember(key, schema)
+        if self.path is None:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fobj:
+                json.dump({"schema": schema}, fobj)
+            os.replace(tmp, self._file(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def stats(self):
+        """Return a dict with the cache counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejections": self.rejections,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """Remove the in-memory entries and reset the counters.  Files on
+        disk are kept.
+        """
+        self._data.clear()
+        self.hits = self.misses = self.rejections = 0
@@ -4,62 +4,182 @@
 from collections import Counter
 from functools import partial
 
-from infermary.literals import literal as lt
+from infermary import instrument as ins
+from infermary.literals import pruning as pr
 from infermary.tables import parallel as pl
+from infermary.tables.inferring import sample as sm, vote as vt
 
 
 CHUNKSIZE = 10
 
 
-def _sample_nonempty(literals, max_sample):
+def _sample_nonempty(literals, max_sample, sampling="head"):
     """Filter for literals that have at least one non-whitespace character,
-    then select the first `max_sample` elements.
+    then select at most `max_sample` elements with the given sampling
+    strategy.  Filtering stops as soon as the sample is full, and the "head"
+    and "stride" samples are returned lazily.
     """
-    return list(filter(lambda l: l.strip(), literals))[:max_sample]
+    nonempty = (literal for literal in literals if literal.strip())
+    return sm.get_sampler(sampling, max_sample).iterate(nonempty)
+
+
+def sample_rows(rows, num_columns, max_sample, sampling="head"):
+    """Return a list of column samples of at most `max_sample` non-empty
+    literals, selected with the given sampling strategy.  Rows are read one
+    at a time, and reading stops as soon as every column sampler is done.
+    """
+    samplers = [
+        sm.get_sampler(sampling, max_sample) for _ in range(num_columns)
+    ]
+    pending = sum(not sampler.done for sampler in samplers)
+    if pending:
+        for row in rows:
+            for sampler, literal in zip(samplers, row):
+                if not sampler.done and literal.strip():
+                    sampler.add(literal)
+                    if sampler.done:
+                        pending -= 1
+            if not pending:
+                break
+    return [sampler.sample() for sampler in samplers]
+
+
+def _count_types_sequential(sample, infer, budget, early_stop):
+    """Return a type Counter for the sampled literals, inferred one at a
+    time, stopping as soon as the vote is decided within the remaining
+    `budget` of literals (see `vote.decided`).
+    """
+    confidence = None if early_stop is True else early_stop
+    counter = Counter()
+    for literal in sample:
+        counter[infer(literal)] += 1
+        budget -= 1
+        if vt.decided(counter, budget, confidence):
+            break
+    return counter
 
 
 def _count_types(
-    literals, inferred_types, max_sample, parallel, chunksize=CHUNKSIZE
+    literals,
+    inferred_types,
+    max_sample,
+    parallel,
+    chunksize=CHUNKSIZE,
+    cache=None,
+    early_stop=False,
+    sampled=False,
 ):
-    """Return a type Counter given a list of literals.
+    """Return a type Counter given a list of literals.  Literals are
+    inferred column-aware (see `pruning.ColumnInferrer`), which gives the
+    same types as `literal.infer_type`.  If a `LiteralCache` is given,
+    repeated literals are inferred only once.  If `early_stop` is set,
+    literals are inferred sequentially until the vote is decided, so the
+    Counter only holds the examined literals.  If `sampled` is True, the
+    literals are already a sample of non-empty literals (see `sample_rows`)
+    and are not sampled again.
     """
-    mapper = pl.map_par(pl.Pool, chunksize=chunksize) if parallel else map
-    return Counter(
-        mapper(
-            partial(lt.infer_type, inferred_types=inferred_types),
-            _sample_nonempty(literals, max_sample),
+    infer = pr.ColumnInferrer(inferred_types, cache)
+    if sampled:
+        sample = literals
+    else:
+        sample = _sample_nonempty(literals, max_sample)
+    if early_stop:
+        budget = len(literals) if isinstance(literals, list) else max_sample
+        return _count_types_sequential(
+            sample, infer, min(budget, max_sample), early_stop
         )
+    mapper = map
+    if parallel:
+        mapper = pl.map_par(pl.pool_class(), chunksize=chunksize)
+    return Counter(mapper(infer, sample))
+
+
+def count_sample(
+    sample,
+    inferred_types,
+    max_sample,
+    cache=None,
+    early_stop=False,
+    sampled=False,
+):
+    """Return a type Counter for a column of literals, inferred serially
+    (see `_count_types`).
+    """
+    return _count_types(
+        sample, inferred_types, max_sample, False, cache=cache,
+        early_stop=early_stop, sampled=sampled,
     )
 
 
-def _count_column_types(columns, inferred_types, max_sample, parallel):
-    """Return a list of type Counters for the given list of table columns.
+def _count_column_types(
+    columns,
+    inferred_types,
+    max_sample,
+    parallel,
+    cache=None,
+    early_stop=False,
+):
+    """Return a list of type Counters for the given list of column samples
+    (see `sample_rows`).
     """
-    mapper = pl.map_par(pl.NDPool) if parallel else map
+    mapper = pl.column_mapper(parallel)
     return mapper(
         partial(
             _count_types,
             inferred_types=inferred_types,
             max_sample=max_sample,
-            parallel=parallel,
+            parallel=pl.column_parallel(parallel),
+            cache=cache,
+            early_stop=early_stop,
+            sampled=True,
         ),
         columns,
     )
 
 
 def _pack_counters(names, counters):
-    """Return a list of dicts that contain the type counters for each name.
+    """Return a list of dicts that contain the type counters for each name,
+    and the number of literals examined to build each counter.
 
-    [{"name": name, "counter": counter} ...]
+    [{"name": name, "counter": counter, "examined": examined} ...]
     """
     return [
-        {"name": name, "counter": counter}
+        {
+            "name": name,
+            "counter": counter,
+            "examined": sum(counter.values()),
+        }
         for name, counter in zip(names, counters)
     ]
 
 
-def count(table, inferred_types, max_sample, parallel):
-    """Return type counters for each header given a table object.
+def count_column(
+    name, sample, inferred_types, max_sample, cache=None, early_stop=False
+):
+    """Return the dict of the type counter of a column sample (see
+    `sample_rows`), as in the list returned by `count`.
+    """
+    counter = count_sample(
+        sample, inferred_types, max_sample, cache, early_stop, sampled=True
+    )
+    return _pack_counters([name], [counter])[0]
+
+
+def count(
+    table,
+    inferred_types,
+    max_sample,
+    parallel,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+):
+    """Return type counters for each header given a table object.  The table
+    rows may be any iterable; only the rows needed to fill the column samples
+    are consumed.  The `sampling` strategy is a name in
+    `sample.STRATEGIES` or a sampler factory.  If `early_stop` is True (or a
+    confidence threshold), each column stops counting once its vote is
+    decided.
 
     Examples
     --------
@@ -68,15 +188,22 @@ def count(table, inferred_types, max_sample, parallel):
     [
         {
             "name": "A",
-            "counts": Counter({"integer": 2})
+            "counts": Counter({"integer": 2}),
+            "examined": 2
         },
         {
             "name": "B",
-            "counts": Counter({"string": 2})
+            "counts": Counter({"string": 2}),
+            "examined": 2
         }
     ]
     """
+    samples = sample_rows(
+        table["rows"], len(table["header"]), max_sample, sampling
+    )
+    if ins.ACTIVE is not None:
+        ins.ACTIVE.record_sample(table["header"], samples)
     counters = _count_column_types(
-        zip(*table["rows"]), inferred_types, max_sample, parallel
+        samples, inferred_types, max_sample, parallel, cache, early_stop
     )
     return _pack_counters(table["header"], counters)
@@ -7,18 +7,51 @@ from infermary.tables.inferring import (
 )
 
 
-def _pack_voted_type(column_counter):
-    """Package the most frequent type into a dict with the column name.
+def _pack_voted_type(column_counter, report_examined=False):
+    """Package the most frequent type into a dict with the column name, and
+    optionally the number of literals examined.
     """
-    return {
+    packed = {
         "name": column_counter["name"],
         "type": vt.vote(column_counter["counter"])
     }
+    if report_examined:
+        packed["examined"] = column_counter["examined"]
+    return packed
 
 
-def infer(table, inferred_types, max_sample, parallel):
-    """Return the inferred schema for the given table of string literals.
+def infer_column(
+    name, sample, inferred_types, max_sample, cache=None, early_stop=False
+):
+    """Return the schema entry of one column given its sample of non-empty
+    literals (see `count.sample_rows`).
     """
-    return list(map(
-        _pack_voted_type,
-        ct.count(table, inferred_types, max_sample, parallel)))
+    return _pack_voted_type(
+        ct.count_column(
+            name, sample, inferred_types, max_sample, cache, early_stop
+        ),
+        bool(early_stop),
+    )
+
+
+def infer(
+    table,
+    inferred_types,
+    max_sample,
+    parallel,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+):
+    """Return the inferred schema for the given table of string literals.  If
+    `early_stop` is set, each column also reports the number of literals
+    examined.
+    """
+    column_counters = ct.count(
+        table, inferred_types, max_sample, parallel, cache, sampling,
+        early_stop
+    )
+    return [
+        _pack_voted_type(column_counter, bool(early_stop))
+        for column_counter in column_counters
+    ]
@@ -0,0 +1,157 @@
+"""Library of strategies for sampling the non-empty literals of a column.
+
+Notes
+-----
+* A sampler is fed one literal at a time with `add` until it is `done`, then
+  returns its sample with `sample`.  The "head" and "stride" samplers are done
+  as soon as the sample is full, which lets callers stop reading rows; the
+  "reservoir" and "head+tail" samplers must see the whole column and hold at
+  most `max_sample` literals.
+* Given an iterable of a single column, `iterate` returns the sample lazily
+  where the strategy allows it ("head" and "stride").
+* Custom strategies are callables that take `max_sample` and return a sampler,
+  e.g. `functools.partial(StrideSampler, step=100)`.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+import random
+
+STRIDE = 10
+
+
+class Sampler(ABC):
+    """Base class of the column samplers."""
+
+    done = False
+
+    def __init__(self, max_sample):
+        self.max_sample = max_sample
+
+    @abstractmethod
+    def add(self, literal):
+        """Offer the next non-empty literal of the column to the sampler."""
+
+    @abstractmethod
+    def sample(self):
+        """Return the sampled literals."""
+
+    def iterate(self, literals):
+        """Return the sample of the given iterable of non-empty literals."""
+        for literal in literals:
+            if self.done:
+                break
+            self.add(literal)
+        return self.sample()
+
+
+class HeadSampler(Sampler):
+    """Sample the first `max_sample` literals."""
+
+    def __init__(self, max_sample):
+        super().__init__(max_sample)
+        self._sample = []
+        self.done = max_sample <= 0
+
+    def add(self, literal):
+        self._sample.append(literal)
+        self.done = len(self._sample) >= self.max_sample
+
+    def sample(self):
+        return self._sample
+
+    def iterate(self, literals):
+        return islice(literals, max(self.max_sample, 0))
+
+
+class StrideSampler(Sampler):
+    """Sample every `step`-th literal, starting with the first, until
+    `max_sample` literals are sampled.
+    """
+
+    def __init__(self, max_sample, step=STRIDE):
+        super().__init__(max_sample)
+        self.step = step
+        self._seen = 0
+        self._sample = []
+        self.done = max_sample <= 0
+
+    def add(self, literal):
+        if self._seen % self.step == 0:
+            self._sample.append(literal)
+            self.done = len(self._sample) >= self.max_sample
+        self._seen += 1
+
+    def sample(self):
+        return self._sample
+
+    def iterate(self, literals):
+        return islice(
+            literals, 0, max(self.max_sample, 0) * self.step, self.step
+        )
+
+
+class ReservoirSampler(Sampler):
+    """Sample `max_sample` literals uniformly at random, with a seeded
+    generator so that results are reproducible.
+    """
+
+    def __init__(self, max_sample, seed=0):
+        super().__init__(max_sample)
+        self._rng = random.Random(seed)
+        self._seen = 0
+        self._sample = []
+
+    def add(self, literal):
+        self._seen += 1
+        if len(self._sample) < self.max_sample:
+            self._sample.append(literal)
+            return
+        index = self._rng.randrange(self._seen)
+        if index < self.max_sample:
+            self._sample[index] = literal
+
+    def sample(self):
+        return self._sample
+
+
+class HeadTailSampler(Sampler):
+    """Sample the first half and the last half of `max_sample` literals."""
+
+    def __init__(self, max_sample):
+        super().__init__(max_sample)
+        max_sample = max(max_sample, 0)
+        self._head_size = (max_sample + 1) // 2
+        self._head = []
+        self._tail = deque(maxlen=max_sample - self._head_size)
+
+    def add(self, literal):
+        if len(self._head) < self._head_size:
+            self._head.append(literal)
+        else:
+            self._tail.append(literal)
+
+    def sample(self):
+        return self._head + list(self._tail)
+
+
+STRATEGIES = {
+    "head": HeadSampler,
+    "stride": StrideSampler,
+    "reservoir": ReservoirSampler,
+    "head+tail": HeadTailSampler,
+}
+
+
+def get_sampler(sampling, max_sample):
+    """Return a new sampler for the given strategy name or factory."""
+    if callable(sampling):
+        return sampling(max_sample)
+    try:
+        return STRATEGIES[sampling](max_sample)
+    except KeyError:
+        raise ValueError(
+            f"Unknown sampling strategy '{sampling}'.  Use one of "
+            f"{sorted(STRATEGIES)} or a sampler factory."
+        )
@@ -0,0 +1,131 @@
+"""Library holding an incremental and mergeable schema inference state.
+
+Notes
+-----
+* An `InferenceState` keeps, for each column, the Counter of the types
+  inferred for its non-empty literals, along with the number of rows seen.
+  Batches of rows are folded in with `update`, and states computed on other
+  batches (e.g. by other workers) are combined with `merge`, so earlier data
+  is never read again.
+* If `max_sample` is given, each column examines at most that many non-empty
+  literals in total; once a column's budget is spent, later batches only
+  add to the row count.  Merged states may exceed the budget.
+* Type ties are broken by first appearance, as in `vote.vote`, so merging
+  states in data order gives the schema of a single pass over the data.
+* `to_dict` returns a JSON-serializable dict from which `from_dict` rebuilds
+  the state; the literal cache, if any, is not serialized.
+"""
+
+from collections import Counter
+
+from infermary.exceptions import TableFormatError
+from infermary.literals import cache as lc, types as tp
+from infermary.tables.inferring import count as ct, vote as vt
+
+
+VERSION = 1
+
+
+class InferenceState:
+    """Per-column type counts, sample budgets, and row counts of the tables
+    seen so far, for the given header and inferred types.
+    """
+
+    def __init__(
+        self,
+        header,
+        inferred_types=None,
+        max_sample=None,
+        cache=None,
+    ):
+        self.header = list(header)
+        self.inferred_types = list(tp.order_inferred_types(inferred_types))
+        self.max_sample = max_sample
+        self.rows = 0
+        self.counters = [Counter() for _ in self.header]
+        self.cache = lc.resolve_cache(cache)
+
+    def remaining(self, index):
+        """Return the remaining sample budget of the column at the given
+        index, or None if it is unlimited.
+        """
+        if self.max_sample is None:
+            return None
+        examined = sum(self.counters[index].values())
+        return max(self.max_sample - examined, 0)
+
+    def update(self, rows):
+        """Fold a batch of rows (any iterable of rows of the header length)
+        into the state, and return the state.
+        """
+        rows = list(rows)
+        if any(len(row) != len(self.header) for row in rows):
+            raise TableFormatError(
+                "The length of each row must match the header length."
+            )
+        for index, column in enumerate(zip(*rows)):
+            budget = self.remaining(index)
+            if budget == 0:
+                continue
+            self.counters[index].update(ct.count_sample(
+                column,
+                self.inferred_types,
+                len(column) if budget is None else budget,
+                cache=self.cache,
+            ))
+        self.rows += len(rows)
+        return self
+
+    def merge(self, other):
+        """Add the counts of another state with the same header and inferred
+        types into this state, and return this state.
+        """
+        if (other.header, other.inferred_types) != (
+            self.header, self.inferred_types
+        ):
+            raise ValueError(
+                "Only states with the same header and inferred types can be "
+                "merged."
+            )
+        for counter, other_counter in zip(self.counters, other.counters):
+            counter.update(other_counter)
+        self.rows += other.rows
+        return self
+
+    def schema(self, report_examined=False):
+        """Return the schema voted from the type counts.  If
+        `report_examined` is True, each entry also holds the number of
+        literals examined.
+        """
+        schema = []
+        for name, counter in zip(self.header, self.counters):
+            entry = {"name": name, "type": vt.vote(counter)}
+            if report_examined:
+                entry["examined"] = sum(counter.values())
+            schema.append(entry)
+        return schema
+
+    def to_dict(self):
+        """Return the compact, JSON-serializable form of the state."""
+        return {
+            "version": VERSION,
+            "header": list(self.header),
+            "inferred_types": list(self.inferred_types),
+            "max_sample": self.max_sample,
+            "rows": self.rows,
+            "counts": [dict(counter) for counter in self.counters],
+        }
+
+    @classmethod
+    def from_dict(cls, data, cache=None):
+        """Return the state rebuilt from the form returned by `to_dict`."""
+        if data.get("version") != VERSION:
+            raise ValueError(
+                f"Unsupported inference state version {data.get('version')}."
+            )
+        state = cls(
+            data["header"], data["inferred_types"], data["max_sample"], cache
+        )
+        state.rows = data["rows"]
+        state.counters = [Counter(counts) for counts in data["counts"]]
+        return state
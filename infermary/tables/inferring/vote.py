@@ -16,3 +16,30 @@ def vote(counter):
     if not counter:
         return 'missing'
     return counter.most_common(1)[0][0]
+
+
+# Minimum number of non-missing literals examined before a confidence
+# threshold can stop the sampling of a column.
+MIN_EXAMINED = 20
+
+
+def decided(counter, remaining, confidence=None):
+    '''Return True if the vote of the type counter can no longer change
+    within the `remaining` literals, i.e. the leading non-missing type has
+    more counts than the runner-up plus the remaining budget.  If a
+    `confidence` in (0, 1] is given, also return True once the leading type
+    holds at least that fraction of at least `MIN_EXAMINED` non-missing
+    counts.'''
+    counts = sorted(
+        (count for type_, count in counter.items() if type_ != 'missing'),
+        reverse=True
+    )
+    if not counts:
+        return False
+    runner_up = counts[1] if len(counts) > 1 else 0
+    if counts[0] > runner_up + remaining:
+        return True
+    if confidence is None:
+        return False
+    total = sum(counts)
+    return total >= MIN_EXAMINED and counts[0] >= confidence * total
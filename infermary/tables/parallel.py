@@ -3,39 +3,48 @@ implementation.
 
 Notes
 -----
-* Non-daemonic process implementation adapted from
-  https://stackoverflow.com/a/8963618"""
+* multiprocessing and concurrent.futures are only imported once a parallel
+  backend is used.
+* A `WorkerPool` is a long-lived pool whose workers import infermary on
+  startup.  When one is used (explicitly or through `session`), columns are
+  distributed over its workers and each column is processed serially, so no
+  nested pools are created.
+* The `parallel` argument selects a backend: False or "serial" runs in the
+  calling thread, "processes" uses fresh (nested) process pools, and
+  "threads" distributes columns over a fresh thread pool.  True uses the
+  session pool if one is installed, otherwise threads on free-threaded
+  builds (GIL disabled) and processes elsewhere.  A `WorkerPool` or any
+  `concurrent.futures.Executor` is used as the pool, without nesting.
+* `imap_bounded` streams tasks through a pool in order, submitting at most
+  a bounded number ahead of the consumer, so that lazily read inputs and
+  their results are never all held in memory."""
 
+from collections import deque
 from contextlib import contextmanager
-import multiprocessing
-from multiprocessing import Process
-from multiprocessing.pool import Pool
+from functools import partial
+from itertools import islice, starmap
+import os
+import sys
+import time
 
+from infermary import instrument as ins
 
-class NoDaemonProcess(Process):
-    """Custom subclass of multiprocessing.Process that is non-daemonic."""
+BACKENDS = ("serial", "threads", "processes")
 
-    @property
-    def daemon(self):
-        return False
-
-    @daemon.setter
-    def daemon(self, value):
-        pass
-
-
-class NoDaemonContext(type(multiprocessing.get_context())):
-    """Define a non-daemonic process context."""
-
-    Process = NoDaemonProcess
 
+def pool_class(nested=False):
+    """Return the process pool class, importing multiprocessing on first
+    use: `processes.NDPool` if `nested` (its workers can create pools), and
+    `multiprocessing.pool.Pool` otherwise.
+    """
+    # pylint: disable=import-outside-toplevel
+    if nested:
+        from infermary.tables.processes import NDPool
 
-class NDPool(Pool):
-    """Define a non-daemonic process pool."""
+        return NDPool
+    from multiprocessing.pool import Pool
 
-    def __init__(self, *args, **kwargs):
-        kwargs["context"] = NoDaemonContext()
-        super(NDPool, self).__init__(*args, **kwargs)
+    return Pool
 
 
 @contextmanager
@@ -48,14 +57,339 @@ def create_pool(pool_class, *args, **kwargs):
     pool.join()
 
 
+def _record_pool(setup, work):
+    """Record the pool setup and work seconds if instrumentation is
+    enabled.
+    """
+    if ins.ACTIVE is not None:
+        ins.ACTIVE.record_pool(setup, work)
+
+
+def _timed_work(map_func, func, data, **kwargs):
+    """Return the result of the pool map function, recording its time."""
+    start = time.perf_counter()
+    result = map_func(func, data, **kwargs)
+    _record_pool(0.0, time.perf_counter() - start)
+    return result
+
+
 def map_par(pool_class, map_method="map", chunksize=1):
     """Return a map function for the given pool class, pool args, and map
     chunksize.
     """
 
     def _map(func, data):
+        start = time.perf_counter()
         with create_pool(pool_class) as pool:
+            mapped = time.perf_counter()
             result = getattr(pool, map_method)(func, data, chunksize=chunksize)
+            done = time.perf_counter()
+        closed = time.perf_counter()
+        _record_pool(closed - done + mapped - start, done - mapped)
+        return result
+
+    return _map
+
+
+def _warm_worker():
+    """Import the infermary modules in a new worker process."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import infermary.table  # noqa: F401
+
+
+class WorkerPool:
+    """Long-lived process pool with warm workers that can be reused across
+    calls to `table.infer_schema` and `table.cast`, either passed as the
+    `parallel` argument or installed with `session`.  The pool is a context
+    manager that closes and joins the workers on exit.
+    """
+
+    def __init__(self, processes=None):
+        # Start the resource tracker before forking, so that workers attaching
+        # to shared memory blocks register them with the parent's tracker.
+        # pylint: disable=import-outside-toplevel
+        from multiprocessing import resource_tracker
+
+        start = time.perf_counter()
+        resource_tracker.ensure_running()
+        self._pool = pool_class()(processes, initializer=_warm_worker)
+        _record_pool(time.perf_counter() - start, 0.0)
+
+    def map(self, func, data, chunksize=1):
+        """Return the list of `func` applied to each element of `data`."""
+        return _timed_work(self._pool.map, func, data, chunksize=chunksize)
+
+    def starmap(self, func, data, chunksize=1):
+        """Return the list of `func` applied to each argument tuple."""
+        return _timed_work(
+            self._pool.starmap, func, data, chunksize=chunksize
+        )
+
+    def submit(self, func, *args):
+        """Schedule `func(*args)` and return a task whose `result` method
+        waits for its value.
+        """
+        return _Task(self._pool.apply_async(func, args))
+
+    def close(self):
+        """Close the pool and wait for the workers to exit."""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _Task:
+    """Future-like wrapper of a `multiprocessing` asynchronous result."""
+
+    def __init__(self, async_result):
+        self._async_result = async_result
+
+    def result(self):
+        """Wait for and return the value of the task."""
+        return self._async_result.get()
+
+
+def _apply_star(func, args):
+    """Return `func` applied to the argument tuple."""
+    return func(*args)
+
+
+class ExecutorPool:
+    """Adapter exposing the map and starmap methods of a `WorkerPool` for a
+    `concurrent.futures` executor.  The executor is not shut down by the
+    adapter; it stays owned by the caller.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def _map(self, func, data, chunksize=1):
+        return list(self.executor.map(func, data, chunksize=chunksize))
+
+    def map(self, func, data, chunksize=1):
+        """Return the list of `func` applied to each element of `data`."""
+        return _timed_work(self._map, func, data, chunksize=chunksize)
+
+    def starmap(self, func, data, chunksize=1):
+        """Return the list of `func` applied to each argument tuple."""
+        return _timed_work(
+            self._map, partial(_apply_star, func), data, chunksize=chunksize
+        )
+
+    def submit(self, func, *args):
+        """Schedule `func(*args)` and return its future."""
+        return self.executor.submit(func, *args)
+
+
+def map_executor(executor_class, map_method="map"):
+    """Return a map function that runs on a fresh executor of the given
+    class.
+    """
+
+    def _map(func, data):
+        start = time.perf_counter()
+        with executor_class() as executor:
+            mapped = time.perf_counter()
+            result = getattr(ExecutorPool(executor), map_method)(func, data)
+            done = time.perf_counter()
+        # The adapter records the work time.
+        _record_pool(time.perf_counter() - done + mapped - start, 0.0)
         return result
 
     return _map
+
+
+def gil_disabled():
+    """Return True if running on a free-threaded build with the GIL
+    disabled.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_backend():
+    """Return the backend used for `parallel=True` without a session:
+    threads on free-threaded builds, processes otherwise.
+    """
+    return "threads" if gil_disabled() else "processes"
+
+
+_SESSION = None
+
+
+@contextmanager
+def session(processes=None, executor=None):
+    """Context manager that uses a pool for every computation with
+    `parallel=True` until exit: a new `WorkerPool`, or the given
+    `concurrent.futures` executor (which is not shut down on exit).
+    """
+    global _SESSION  # pylint: disable=global-statement
+    previous = _SESSION
+    if executor is not None:
+        _SESSION = ExecutorPool(executor)
+        try:
+            yield executor
+        finally:
+            _SESSION = previous
+        return
+    with WorkerPool(processes) as pool:
+        _SESSION = pool
+        try:
+            yield pool
+        finally:
+            _SESSION = previous
+
+
+def _is_executor(obj):
+    """Return True if the object is a `concurrent.futures` executor, which
+    requires concurrent.futures to be imported already.
+    """
+    futures = sys.modules.get("concurrent.futures")
+    return futures is not None and isinstance(obj, futures.Executor)
+
+
+def _thread_pool_class():
+    """Return `concurrent.futures.ThreadPoolExecutor`, imported on first
+    use.
+    """
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor
+
+
+def get_pool(parallel):
+    """Return the pool to use for the given `parallel` argument: a
+    `WorkerPool`, an adapted executor, or the session pool if `parallel` is
+    True.  Return None if no pool is given nor installed by a session.
+    """
+    if isinstance(parallel, (WorkerPool, ExecutorPool)):
+        return parallel
+    if _is_executor(parallel):
+        return ExecutorPool(parallel)
+    if parallel is True:
+        return _SESSION
+    return None
+
+
+def get_backend(parallel):
+    """Return the backend name ("serial", "threads", or "processes") used
+    without a pool for the given `parallel` argument.  A ValueError is raised
+    for an unknown backend.
+    """
+    if isinstance(parallel, str):
+        if parallel not in BACKENDS:
+            raise ValueError(
+                f"Unknown parallel backend '{parallel}'.  Use one of "
+                f"{list(BACKENDS)}, a bool, a WorkerPool, or an executor."
+            )
+        return parallel
+    if parallel:
+        return default_backend()
+    return "serial"
+
+
+def is_parallel(parallel):
+    """Return True if the `parallel` argument requests a parallel
+    computation.
+    """
+    return get_pool(parallel) is not None or get_backend(parallel) != "serial"
+
+
+def task_mapper(parallel):
+    """Return the map function used to distribute independent tasks (e.g.
+    column blocks) for the given `parallel` argument.
+    """
+    pool = get_pool(parallel)
+    if pool is not None:
+        return pool.map
+    backend = get_backend(parallel)
+    if backend == "processes":
+        return map_par(pool_class())
+    if backend == "threads":
+        return map_executor(_thread_pool_class())
+    return map
+
+
+def column_mapper(parallel, map_method="map"):
+    """Return the map function used to distribute table columns for the
+    given `parallel` argument.
+    """
+    pool = get_pool(parallel)
+    if pool is not None:
+        return getattr(pool, map_method)
+    backend = get_backend(parallel)
+    if backend == "processes":
+        return map_par(pool_class(nested=True), map_method=map_method)
+    if backend == "threads":
+        return map_executor(_thread_pool_class(), map_method=map_method)
+    return map if map_method == "map" else starmap
+
+
+def default_in_flight():
+    """Return the default number of tasks submitted ahead by
+    `imap_bounded`: twice the number of CPUs.
+    """
+    return 2 * (os.cpu_count() or 1)
+
+
+def _imap_pool(pool, func, data, max_in_flight):
+    """Yield `func` applied to each element of `data`, in order, keeping at
+    most `max_in_flight` tasks submitted to the pool.
+    """
+    data = iter(data)
+    tasks = deque(
+        pool.submit(func, item) for item in islice(data, max_in_flight)
+    )
+    waited = 0.0
+    try:
+        while tasks:
+            start = time.perf_counter()
+            result = tasks.popleft().result()
+            waited += time.perf_counter() - start
+            for item in islice(data, 1):
+                tasks.append(pool.submit(func, item))
+            yield result
+    finally:
+        _record_pool(0.0, waited)
+
+
+def imap_bounded(parallel, func, data, max_in_flight=None):
+    """Lazily yield `func` applied to each element of the iterable `data`,
+    in order, computed by the pool or backend of the `parallel` argument.
+    At most `max_in_flight` elements (by default, `default_in_flight()`) are
+    read ahead of the consumer.  A fresh pool is created for the iteration
+    and closed once it ends (after its submitted tasks complete).
+    """
+    if max_in_flight is None:
+        max_in_flight = default_in_flight()
+    pool = get_pool(parallel)
+    if pool is not None:
+        yield from _imap_pool(pool, func, data, max_in_flight)
+        return
+    backend = get_backend(parallel)
+    if backend == "serial":
+        yield from map(func, data)
+    elif backend == "processes":
+        with WorkerPool() as pool:
+            yield from _imap_pool(pool, func, data, max_in_flight)
+    else:
+        start = time.perf_counter()
+        with _thread_pool_class()() as executor:
+            _record_pool(time.perf_counter() - start, 0.0)
+            yield from _imap_pool(
+                ExecutorPool(executor), func, data, max_in_flight
+            )
+
+
+def column_parallel(parallel):
+    """Return the `parallel` argument for the computation within a column:
+    nested process pools are only used with the "processes" backend and no
+    pool.
+    """
+    return get_pool(parallel) is None and get_backend(parallel) == "processes"
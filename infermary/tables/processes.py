@@ -0,0 +1,39 @@
+"""Define a non-daemonic process pool, whose workers can create nested
+pools.  This module is imported on first use of the processes backend (see
+`parallel.pool_class`).
+
+Notes
+-----
+* Non-daemonic process implementation adapted from
+  https://stackoverflow.com/a/8963618
+"""
+
+import multiprocessing
+from multiprocessing import Process
+from multiprocessing.pool import Pool
+
+
+class NoDaemonProcess(Process):
+    """Custom subclass of multiprocessing.Process that is non-daemonic."""
+
+    @property
+    def daemon(self):
+        return False
+
+    @daemon.setter
+    def daemon(self, value):
+        pass
+
+
+class NoDaemonContext(type(multiprocessing.get_context())):
+    """Define a non-daemonic process context."""
+
+    Process = NoDaemonProcess
+
+
+class NDPool(Pool):
+    """Define a non-daemonic process pool."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs["context"] = NoDaemonContext()
+        super(NDPool, self).__init__(*args, **kwargs)
@@ -10,21 +10,117 @@ Notes
   }
 """
 
+from itertools import chain, islice
+
+from infermary.literals import cache as lc
 from infermary.tables import helpers as hp
 from infermary.tables.casting import cast as caster
-from infermary.tables.inferring import infer as inferrer
+from infermary.tables.inferring import cache as sc, infer as inferrer
 
 
-def infer_schema(table, inferred_types, max_sample, parallel):
-    """Return the inferred schema for the given table of string literals.
+def _peek_rows(table, num_rows):
+    """Return the first rows of the table and the table with its rows
+    unchanged (chained back if they are an iterator).
     """
-    return inferrer.infer(
-        hp.validate_table(table), inferred_types, max_sample, parallel
+    rows = table["rows"]
+    if isinstance(rows, list):
+        return rows[:num_rows], table
+    sample = list(islice(rows, num_rows))
+    return sample, dict(table, rows=chain(sample, rows))
+
+
+def infer_schema(
+    table,
+    inferred_types,
+    max_sample,
+    parallel,
+    cache=None,
+    sampling="head",
+    early_stop=False,
+    schema_cache=None,
+):
+    """Return the inferred schema for the given table of string literals.  If
+    a `SchemaCache` is given (and the sampling strategy is a name), a cached
+    schema of the same layout is returned if the sample rows cast under it.
+    """
+    table = hp.validate_table(table)
+    key = None
+    if schema_cache is not None and isinstance(sampling, str):
+        sample, table = _peek_rows(table, sc.SAMPLE_ROWS)
+        key = schema_cache.key(
+            table["header"],
+            inferred_types,
+            sample,
+            (max_sample, sampling, early_stop),
+        )
+        schema = schema_cache.lookup(key, sample, inferred_types)
+        if schema is not None:
+            return schema
+    schema = inferrer.infer(
+        table,
+        inferred_types,
+        max_sample,
+        parallel,
+        lc.resolve_cache(cache),
+        sampling,
+        early_stop,
     )
+    if key is not None:
+        schema_cache.store(key, schema)
+    return schema
 
 
-def cast(table, schema, parallel):
+def cast(
+    table,
+    schema,
+    parallel,
+    report_formats=False,
+    cache=None,
+    transport="pickle",
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
     """Return a table of value objects given a table of literal values and a
     schema.
     """
-    return caster.cast(hp.validate_table(table), schema, parallel)
+    return caster.cast(
+        hp.validate_table(table),
+        schema,
+        parallel,
+        report_formats,
+        lc.resolve_cache(cache),
+        transport,
+        engine,
+        layout,
+        dictionary,
+    )
+
+
+def cast_iter(
+    table,
+    schema,
+    batch_size,
+    parallel,
+    max_in_flight=None,
+    report_formats=False,
+    cache=None,
+    engine="python",
+    layout="rows",
+    dictionary=False,
+):
+    """Return an iterator over the tables of value objects of successive
+    batches of rows.
+    """
+    return caster.cast_iter(
+        hp.validate_table(table),
+        schema,
+        batch_size,
+        parallel,
+        max_in_flight,
+        report_formats,
+        lc.resolve_cache(cache),
+        engine,
+        layout,
+        dictionary,
+    )
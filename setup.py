@@ -7,11 +7,14 @@ setup(
     version='1.0.0',
     description='Library for type inference and casting of tabular data.',
     author='Klearly',
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
     include_package_data=True,
     install_requires=[
         'decorator'
     ],
+    extras_require={
+        'numpy': ['numpy']
+    },
     test_suite='pytest',
     tests_require=[
         'pytest==3.5.0',
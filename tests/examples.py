@@ -100,6 +100,8 @@ EXAMPLES = {
         ("1e-0", 1),
         ("-1", -1),
         ("1,234,567", 1234567),
+        ("12345678901234567891", 12345678901234567891),
+        ("-1,234,567,890,123,456,789", -1234567890123456789),
         xfail("1,23,4"),
         xfail("01,234"),
         xfail("01"),
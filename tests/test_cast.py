@@ -5,9 +5,11 @@ Notes
 * Update these tests to use only the public API.
 """
 
+from datetime import datetime
+
 import pytest
 
-from infermary.literals.casting import casters
+from infermary.literals.casting import casters, formats as fmt, temporal as tm
 from tests.examples import EXAMPLES
 
 
@@ -73,3 +75,27 @@ def test_boolean(literal, result):
 @pytest.mark.parametrize("literal, result", EXAMPLES["string"])
 def test_string(literal, result):
     return _caster_test("string_", literal, result)
+
+
+def _strptime_loop(literal, formats):
+    for format_ in formats:
+        try:
+            return datetime.strptime(literal, format_)
+        except ValueError:
+            continue
+    return None
+
+
+@pytest.mark.parametrize("literal", [
+    "2017-10-13", "2017-1-3", "2017-02-29", "2016-02-29", "10/13/17",
+    "12/31/69", "2017-10-13 15:14:13", "2017-10-13  15:14", "2017-10-13T15:14",
+    "2017-10-13t15:14:13z", "2017-10-13 15:14:13.5Z", "2017-10-13+15:14:13",
+    "10/13/2017 3:14:13 pm", "15:14:60", "24:00", "3:14pm", "3:14 PM", "a",
+])
+def test_temporal_plan_matches_strptime(literal):
+    for formats in (fmt.DATE, fmt.TIME, fmt.DATETIME, fmt.DATELIKE):
+        try:
+            value = tm.get_plan(formats).parse(literal)
+        except TypeError:
+            value = None
+        assert value == _strptime_loop(literal, formats)
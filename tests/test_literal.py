@@ -1,9 +1,18 @@
 """Test type casting against a battery of examples.
 """
 
+import subprocess
+import sys
+
 import pytest
 
 from infermary import literal as lt
+from infermary.literals import types as tp
+from infermary.literals import disjoint as dj
+from infermary.literals import pruning as pr
+from infermary.literals import shapes as sh
+from infermary.literals.casting import helpers as chp
+from infermary.literals.cache import LiteralCache
 from infermary.literals.helpers import check_and_prepare_literal
 from infermary.exceptions import CastError, InvalidLiteralError
 from tests.examples import EXAMPLES
@@ -28,6 +37,39 @@ def test_literal(literal, result_value, result_type):
     assert lt.infer_type(literal, inferred_types=[result_type]) == result_type
 
 
+def _all_example_literals():
+    return sorted({
+        example.values[0] if hasattr(example, "values") else example[0]
+        for type_examples in EXAMPLES.values()
+        for example in type_examples
+    } | {" 1 ", "NAN", "1_000", "2017-10-13t15:14:13", "$5%", "inf",
+         "-Infinity", "1,2345%", "$1,2345"})
+
+
+def _reference_infer_type(literal, inferred_types):
+    """Infer the type by attempting every caster in order."""
+    for type_ in inferred_types:
+        try:
+            lt.cast(literal, type_)
+            return type_
+        except CastError:
+            continue
+    return None
+
+
+@pytest.mark.parametrize("inferred_types", [
+    None,
+    list(tp.ORDERED_TYPE_TO_CASTER),
+    ["integer", "float", "datetime", "time"],
+    ["datelike", "percent", "currency"],
+])
+def test_infer_type_matches_reference(inferred_types):
+    ordered_types = tp.order_inferred_types(inferred_types)
+    for literal in _all_example_literals():
+        assert lt.infer_type(literal, inferred_types) == \
+            _reference_infer_type(literal, ordered_types), literal
+
+
 def test_check_and_prepare_literal_pass():
     assert check_and_prepare_literal("  1 ") == "1"
 
@@ -42,6 +84,20 @@ def test_cast_type_fail():
         lt.cast("1", "float")
 
 
+def test_try_cast():
+    assert lt.try_cast(" 1 ", "integer") == 1
+    assert lt.try_cast("", "string") is None
+    for literal, type_ in [
+        ("1", "float"), ("inf", "integer"), ("1,2345%", "percent"),
+        ("$1,2345", "currency"), ("13:61", "time"),
+    ]:
+        assert lt.try_cast(literal, type_) is lt.FAILED
+        with pytest.raises(CastError):
+            lt.cast(literal, type_)
+    with pytest.raises(InvalidLiteralError):
+        lt.try_cast(1, "integer")
+
+
 def test_cast_with_error_success():
     res = lt.cast_with_error("1", "integer")
     assert res["errors"] == []
@@ -54,3 +110,150 @@ def test_cast_with_error_fail():
     assert "detail" in err
     assert err["type"] == "CastError"
     assert res["result"] is None
+
+
+def test_literal_cache_hits_and_evictions():
+    cache = LiteralCache(maxsize=2)
+    types = tp.order_inferred_types(None)
+    assert cache.infer_type("1", types) == "number"
+    assert cache.infer_type("1", types) == "number"
+    assert cache.infer_type("foo", types) == "string"
+    assert cache.infer_type("2017-10-13", types) == "date"
+    assert cache.stats() == {
+        "hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2
+    }
+
+
+def test_literal_cache_cast_failure():
+    cache = LiteralCache()
+    for _ in range(2):
+        with pytest.raises(CastError):
+            cache.cast("1", "float")
+    assert cache.cast(" 1 ", "integer") == 1
+    assert cache.hits == 1
+    with pytest.raises(InvalidLiteralError):
+        cache.cast(1, "integer")
+
+
+def test_scan_number():
+    assert chp.scan_number("1,234.5") == (1234.5, "1234.5")
+    assert chp.scan_number("01") is chp.FAILED
+    assert chp.scan_number("1,23") is chp.FAILED
+    assert lt.cast("1_000", "integer") == 1000
+    assert lt.cast("-" + "0" * 5000 + "1", "integer") == -1
+    assert lt.try_cast("1" + "0" * 400, "integer") is lt.FAILED
+    assert lt.cast("1" + "0" * 400, "number") == float("inf")
+    assert lt.cast("9" * 30, "integer") == int("9" * 30)
+    assert lt.cast("9" * 30, "number") == float("9" * 30)
+
+
+def test_disjoint_types():
+    disjoint = dj.disjoint_types()
+    assert "integer" in disjoint["float"]
+    assert "date" in disjoint["number"]
+    assert "number" not in disjoint["integer"]
+    assert "percent" not in disjoint["currency"]
+    assert "datelike" not in disjoint["date"]
+    assert disjoint["string"] == frozenset()
+
+
+@pytest.mark.parametrize("cache", [None, LiteralCache()])
+def test_column_inferrer(cache):
+    types = tp.order_inferred_types(list(tp.ORDERED_TYPE_TO_CASTER))
+    column = (
+        ["2017-10-13 12:00:00", "1.5", "$1,000", "10%", "$5 and 7%"] * 3
+        + ["2017-10-13", "2017-10-13T12:00:00", "1e-1", "1", "NaN", "True"]
+        + [example[0] for examples in EXAMPLES.values()
+           for example in examples if isinstance(example[0], str)]
+    )
+    inferrer = pr.ColumnInferrer(types, cache)
+    assert list(map(inferrer, column)) == [
+        lt.infer_type(literal, types) for literal in column
+    ]
+    assert {"datetime", "percent", "currency"} <= set(inferrer.winners)
+
+
+@pytest.mark.parametrize(
+    "literal, shape",
+    [
+        ("2017-01-30", "9999-09-99"),
+        ("-1e-5", "-9a-9"),
+        ("$1,005.00", "$9,099.09"),
+        ("0.5%", "0.9%"),
+        ("\u0661\u0662:30 PM", "\u0661\u0662:99 aa"),
+    ],
+)
+def test_shape(literal, shape):
+    assert sh.shape(literal) == shape
+
+
+def test_shape_cache():
+    types = tp.order_inferred_types(list(tp.ORDERED_TYPE_TO_CASTER))
+    cache = sh.ShapeCache(types)
+    column = [
+        "2017-10-13", "2017-13-13", "12:30 PM", "12:30 XX", "1e5", "1e-5",
+        "99e-2", "10e-1", "inf", "foo", "nan", "true", "12", "01", "10%",
+        "05%", "$1K", "$1X", "15.5", "0.5",
+    ] + [example[0] for examples in EXAMPLES.values()
+         for example in examples if isinstance(example[0], str)]
+    for _ in range(2):
+        assert [cache.infer_type(literal) for literal in column] == [
+            lt.infer_type(literal, types) for literal in column
+        ]
+    assert cache.stats()["hits"] >= len(column)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_shape_cache_large_integers():
+    # Same shape, but only the first one fits a float and is an integer.
+    large = ["1" + "0" * 308, "2" + "0" * 308]
+    types = tp.order_inferred_types(list(tp.ORDERED_TYPE_TO_CASTER))
+    assert [lt.infer_type(literal, types) for literal in large] == [
+        "integer", "number"
+    ]
+    assert list(map(sh.ShapeCache(types).infer_type, large)) == [
+        "integer", "number"
+    ]
+    assert list(map(pr.ColumnInferrer(types), large)) == [
+        "integer", "number"
+    ]
+
+
+# Generous budget (in seconds) for `import infermary` on slow machines.
+IMPORT_BUDGET = 0.25
+
+LAZY_MODULES = [
+    "asyncio", "concurrent.futures", "decorator", "multiprocessing", "numpy"
+]
+
+
+def test_import_budget():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import infermary\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(sys.modules))\n"
+        "infermary.literal.cast_with_error\n"
+        "print('decorator' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True,
+    ).stdout.split("\n")
+    assert float(out[0]) < IMPORT_BUDGET
+    modules = set(out[1].split())
+    assert [name for name in LAZY_MODULES if name in modules] == []
+    assert out[2] == "True"
+
+
+def test_with_error_lazy_attributes():
+    assert lt.cast_with_error is lt.cast_with_error
+    with pytest.raises(AttributeError):
+        lt.foo_with_error  # pylint: disable=pointless-statement
+
+
+def test_warmup():
+    lt.warmup()
+    assert lt.cast("10:00 PM", "time").hour == 22
@@ -1,11 +1,23 @@
 """Test table schema inference and casting."""
 
+from array import array
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import csv
 import datetime
+import gzip
+import json
 
 import pytest
 
 from infermary import exceptions as exc
+from infermary import instrument as ins
+from infermary import literal as lt
 from infermary import table as tb
+from infermary.literals import types as tp
+from infermary.tables import parallel as pl
+from infermary.tables.casting import layout as ly, vector as vc
+from infermary.tables.inferring import count as ct
 from tests.dataset import TABLE, TABLE_W_SYMBOLS
 
 
@@ -71,6 +83,552 @@ def test_cast_parallel():
     assert first_row[4] == datetime.time(15, 14)
 
 
+def test_cast_report_formats():
+    schema = tb.infer_schema(TABLE["data"])
+    formats = tb.cast(TABLE["data"], schema, report_formats=True)["formats"]
+    assert formats[3] == {"name": "Date", "formats": {"%Y-%m-%d": 6}}
+    assert formats[4]["formats"] == {"%I:%M %p": 4, "%H:%M": 1}
+    assert formats[0]["formats"] == {}
+
+
+def test_cast_pinned_formats_match_literal_cast():
+    dates = ["10/13/17", "10/13/2017", "2017-10-13", "10/13/17", "1/2/03",
+             "13/10/2017", "", "2017-10-13 15:14:13"]
+    for type_ in ("date", "datelike"):
+        data = {"header": ["A"], "rows": [[date] for date in dates]}
+        rows = tb.cast(data, [{"name": "A", "type": type_}])["rows"]
+        expected = [
+            lt.cast_with_error(date, type_)["result"] for date in dates
+        ]
+        assert [row[0] for row in rows] == expected
+
+
+def test_cache_matches_uncached():
+    cache = tb.LiteralCache()
+    for data_table in (TABLE, TABLE_W_SYMBOLS):
+        schema = tb.infer_schema(data_table["data"])
+        assert tb.infer_schema(data_table["data"], cache=cache) == schema
+        assert tb.infer_schema(data_table["data"], cache=True) == schema
+        assert tb.cast(data_table["data"], schema, cache=cache) == \
+            tb.cast(data_table["data"], schema)
+    assert cache.hits > 0
+
+
+def test_streaming_rows():
+    data = TABLE["data"]
+    schema = tb.infer_schema(data)
+    stream = {"header": data["header"], "rows": iter(data["rows"])}
+    assert tb.infer_schema(stream) == schema
+    stream = {"header": data["header"], "rows": iter(data["rows"])}
+    assert tb.cast(stream, schema) == tb.cast(data, schema)
+
+
+def test_streaming_rows_early_termination():
+    consumed = []
+
+    def rows():
+        for i in range(1000):
+            consumed.append(i)
+            yield [str(i), "foo"]
+
+    schema = tb.infer_schema(
+        {"header": ["A", "B"], "rows": rows()}, max_sample=10
+    )
+    assert [col["type"] for col in schema] == ["number", "string"]
+    assert len(consumed) == 10
+
+
+def test_table_error_empty_rows_iterator():
+    with pytest.raises(exc.TableFormatError):
+        tb.infer_schema({"header": ["A"], "rows": iter([])})
+
+
+def _write_csv(path, data, opener=open):
+    with opener(path, "wt", newline="") as fobj:
+        writer = csv.writer(fobj)
+        writer.writerow(data["header"])
+        writer.writerows(data["rows"])
+
+
+def test_from_path(tmp_path):
+    data = TABLE["data"]
+    schema = tb.infer_schema(data)
+    for name, opener in (("t.csv", open), ("t.csv.gz", gzip.open)):
+        path = str(tmp_path / name)
+        _write_csv(path, data, opener)
+        assert tb.infer_schema_from_path(path) == schema
+        assert tb.cast_from_path(path, schema) == tb.cast(data, schema)
+
+
+def test_from_path_random_offsets(tmp_path):
+    path = str(tmp_path / "t.csv")
+    rows = [[str(i), "foo"] for i in range(200)] + [["bar", "1.5"]] * 2000
+    _write_csv(path, {"header": ["A", "B"], "rows": rows})
+    head_schema = tb.infer_schema_from_path(path, max_sample=100)
+    assert [col["type"] for col in head_schema] == ["number", "string"]
+    schema = tb.infer_schema_from_path(
+        path, max_sample=100, random_offsets=20, head_rows=10, seed=0
+    )
+    assert [col["type"] for col in schema] == ["string", "number"]
+
+
+def test_from_path_random_offsets_gzip_fail(tmp_path):
+    path = str(tmp_path / "t.csv.gz")
+    _write_csv(path, TABLE["data"], gzip.open)
+    res = tb.infer_schema_from_path_with_error(path, random_offsets=1)
+    assert res["errors"][0]["type"] == "ValueError"
+
+
+@pytest.mark.parametrize("sampling, expected", [
+    ("head", ["1", "2", "3", "4"]),
+    ("stride", ["1", "11", "21", "31"]),
+    ("head+tail", ["1", "2", "99", "100"]),
+])
+def test_sampling_strategies(sampling, expected):
+    literals = [str(i) for i in range(1, 101)]
+    sample = ct._sample_nonempty(iter(literals), 4, sampling)
+    assert list(sample) == expected
+
+
+def test_sampling_reservoir_seeded():
+    literals = [str(i) for i in range(1000)]
+    first = ct._sample_nonempty(literals, 10, "reservoir")
+    assert first == ct._sample_nonempty(literals, 10, "reservoir")
+    assert len(set(first)) == 10
+
+
+def test_sampling_tail_type_change():
+    rows = [["1"]] * 500 + [[" "]] * 500 + [["foo"]] * 1000
+    data = {"header": ["A"], "rows": rows}
+    assert tb.infer_schema(data, max_sample=100)[0]["type"] == "number"
+    schema = tb.infer_schema(data, max_sample=100, sampling="reservoir")
+    assert schema[0]["type"] == "string"
+
+
+def test_sampling_once(monkeypatch):
+    def resample(literals, max_sample, sampling="head"):
+        raise AssertionError("column samples are sampled again")
+
+    schema = tb.infer_schema(TABLE["data"])
+    monkeypatch.setattr(ct, "_sample_nonempty", resample)
+    assert tb.infer_schema(TABLE["data"], sampling="reservoir") == schema
+    early = tb.infer_schema(TABLE["data"], early_stop=True)
+    assert [column["type"] for column in early] == [
+        column["type"] for column in schema
+    ]
+
+
+def test_sampling_unknown_strategy():
+    with pytest.raises(ValueError):
+        tb.infer_schema(TABLE["data"], sampling="tail")
+
+
+def test_early_stop_exact():
+    for data_table in (TABLE, TABLE_W_SYMBOLS):
+        schema = tb.infer_schema(data_table["data"])
+        early = tb.infer_schema(data_table["data"], early_stop=True)
+        assert [col["type"] for col in early] == \
+            [col["type"] for col in schema]
+    rows = [[str(i), "foo" if i % 3 else "1"] for i in range(1000)]
+    early = tb.infer_schema({"header": ["A", "B"], "rows": rows},
+                            max_sample=100, early_stop=True)
+    assert early == [
+        {"name": "A", "type": "number", "examined": 51},
+        {"name": "B", "type": "string", "examined": 77},
+    ]
+
+
+def test_early_stop_confidence():
+    rows = [["foo" if i % 10 else "1"] for i in range(1000)]
+    early = tb.infer_schema({"header": ["A"], "rows": rows}, early_stop=0.8)
+    assert early == [{"name": "A", "type": "string", "examined": 20}]
+
+
+def test_inference_state_update_and_merge():
+    data = TABLE["data"]
+    header, rows = data["header"], data["rows"]
+    schema = tb.infer_schema(data)
+    state = tb.InferenceState(header)
+    for row in rows:
+        state.update([row])
+    assert state.schema() == schema
+    assert state.rows == len(rows)
+    first = tb.InferenceState(header).update(rows[:1])
+    rest = tb.InferenceState(header).update(rows[1:])
+    assert first.merge(rest).schema() == schema
+    assert first.to_dict() == state.to_dict()
+    restored = tb.InferenceState.from_dict(
+        json.loads(json.dumps(state.to_dict()))
+    )
+    assert restored.schema() == schema
+    assert restored.to_dict() == state.to_dict()
+    with pytest.raises(ValueError):
+        state.merge(tb.InferenceState(header, inferred_types=["integer"]))
+    with pytest.raises(exc.TableFormatError):
+        state.update([["1"]])
+    # The state holds its own copy of the default type order.
+    default_types = list(tp.order_inferred_types(None))
+    tb.InferenceState(header).inferred_types.reverse()
+    state.to_dict()["inferred_types"].clear()
+    assert tp.order_inferred_types(None) == default_types
+
+
+def test_inference_state_budget():
+    state = tb.InferenceState(["A"], max_sample=3)
+    state.update([["1"], [""], ["2"]]).update([["foo"], ["bar"], ["baz"]])
+    assert state.rows == 6
+    assert state.remaining(0) == 0
+    assert state.schema(report_examined=True) == [
+        {"name": "A", "type": "number", "examined": 3}
+    ]
+
+
+def test_schema_cache(tmp_path):
+    data = TABLE["data"]
+    schema = tb.infer_schema(data)
+    cache = tb.SchemaCache(path=str(tmp_path))
+    assert tb.infer_schema(data, schema_cache=cache) == schema
+    assert tb.infer_schema(data, schema_cache=cache) == schema
+    assert cache.stats()["hits"] == 1
+    # Same layout from a generator, through the on-disk store.
+    disk = tb.SchemaCache(path=str(tmp_path))
+    rows = iter(data["rows"])
+    table = {"header": data["header"], "rows": rows}
+    assert tb.infer_schema(table, schema_cache=disk) == schema
+    assert disk.stats()["hits"] == 1
+    # A cached schema that no longer casts the sample is rejected.
+    data = {"header": ["A"], "rows": [["1"], ["2"]]}
+    key = cache.key(["A"], tp.order_inferred_types(None), data["rows"],
+                    (tb.MAX_SAMPLE, "head", False))
+    cache.store(key, [{"name": "A", "type": "boolean"}])
+    assert tb.infer_schema(data, schema_cache=cache) == [
+        {"name": "A", "type": "number"}
+    ]
+    assert cache.stats()["rejections"] == 1
+    assert tb.infer_schema(data, schema_cache=cache)[0]["type"] == "number"
+    # Short rows fail the verification instead of raising.
+    short = {"header": ["A", "B"], "rows": [["1", "x"], ["2"]]}
+    schema = tb.infer_schema(short, schema_cache=cache)
+    assert tb.infer_schema(short, schema_cache=cache) == schema
+    assert cache.stats()["rejections"] == 2
+    # Zip codes with a leading zero do not share a layout with numbers, and a
+    # cached type that an earlier type outvotes is rejected.
+    zips = {"header": ["A"], "rows": [["01234"], ["02345"]]}
+    numbers = {"header": ["A"], "rows": [["12345"], ["23456"]]}
+    assert tb.infer_schema(zips, schema_cache=cache)[0]["type"] == "string"
+    expected = tb.infer_schema(numbers)
+    assert tb.infer_schema(numbers, schema_cache=cache) == expected
+    key = cache.key(["A"], tp.order_inferred_types(None), numbers["rows"],
+                    (tb.MAX_SAMPLE, "head", False))
+    cache.store(key, [{"name": "A", "type": "string"}])
+    assert tb.infer_schema(numbers, schema_cache=cache) == expected
+    assert cache.stats()["rejections"] == 3
+
+
+def test_worker_pool():
+    schema = tb.infer_schema(TABLE["data"])
+    expected = tb.cast(TABLE["data"], schema)
+    with tb.WorkerPool(2) as pool:
+        for _ in range(2):
+            assert tb.infer_schema(TABLE["data"], parallel=pool) == schema
+            assert tb.cast(TABLE["data"], schema, parallel=pool) == expected
+
+
+def test_parallel_session():
+    schema = tb.infer_schema(TABLE["data"])
+    with tb.parallel_session(2) as pool:
+        assert pl.get_pool(True) is pool
+        assert tb.infer_schema(TABLE["data"], parallel=True) == schema
+    assert pl.get_pool(True) is None
+
+
+def test_parallel_backends():
+    schema = tb.infer_schema(TABLE["data"])
+    expected = tb.cast(TABLE["data"], schema, report_formats=True)
+    cache = tb.LiteralCache()
+    with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as procs:
+        for parallel in ("serial", "threads", "processes", threads, procs):
+            assert tb.infer_schema(TABLE["data"], parallel=parallel) == schema
+            for transport in ("pickle", "shared"):
+                res = tb.cast(TABLE["data"], schema, parallel=parallel,
+                              report_formats=True, cache=cache,
+                              transport=transport)
+                assert res == expected
+    with pytest.raises(ValueError):
+        tb.infer_schema(TABLE["data"], parallel="fibers")
+
+
+def test_parallel_default_backend(monkeypatch):
+    monkeypatch.setattr(pl.sys, "_is_gil_enabled", lambda: False,
+                        raising=False)
+    assert pl.get_backend(True) == "threads"
+    monkeypatch.setattr(pl.sys, "_is_gil_enabled", lambda: True,
+                        raising=False)
+    assert pl.get_backend(True) == "processes"
+    assert pl.get_backend(False) == "serial"
+    assert not pl.is_parallel("serial")
+
+
+def test_parallel_session_executor():
+    schema = tb.infer_schema(TABLE["data"])
+    with ThreadPoolExecutor(2) as executor:
+        with tb.parallel_session(executor=executor):
+            assert pl.get_pool(True).executor is executor
+            assert tb.infer_schema(TABLE["data"], parallel=True) == schema
+        assert pl.get_pool(True) is None
+
+
+def test_cast_shared_transport():
+    rows = [
+        [str(i), f"{i}.5", "TRUE" if i % 2 else "", "2017-10-13", "foo",
+         "1" + "0" * 30]
+        for i in range(50)
+    ]
+    data = {"header": list("ABCDEF"), "rows": rows}
+    schema = [
+        {"name": name, "type": type_} for name, type_ in zip(
+            "ABCDEF",
+            ["integer", "float", "boolean", "date", "string", "integer"]
+        )
+    ]
+    expected = tb.cast(data, schema, report_formats=True)
+    for parallel in (True, tb.WorkerPool(2)):
+        res = tb.cast(data, schema, parallel=parallel, report_formats=True,
+                      transport="shared")
+        assert res == expected
+        assert type(res["rows"][1][2]) is bool
+        if parallel is not True:
+            parallel.close()
+
+
+def test_cast_numpy_engine():
+    pytest.importorskip("numpy")
+    literals = [
+        "1", " -2 ", "1.5", "-.5", "5.", "01", "-01", "0.0", "1,234", "1e3",
+        "1e-1", "+1", "", "null", "true", " FALSE ", "foo", "٣",
+        "12345678901234567", "1" + "0" * 30, "1\x00", "--1", ".", "1\x1c",
+        "\x1f-1.5",
+    ]
+    types = ["missing", "integer", "float", "number", "boolean", "string"]
+    data = {
+        "header": types,
+        "rows": [[literal] * len(types) for literal in literals],
+    }
+    schema = [{"name": type_, "type": type_} for type_ in types]
+    expected = tb.cast(data, schema)
+    for parallel in (False, "threads"):
+        for transport in ("pickle", "shared"):
+            assert tb.cast(data, schema, parallel=parallel, engine="numpy",
+                           transport=transport) == expected
+    assert type(tb.cast(data, schema, engine="auto")["rows"][0][1]) is int
+
+
+def test_cast_engine_without_numpy(monkeypatch):
+    monkeypatch.setattr(vc, "np", None)
+    schema = tb.infer_schema(TABLE["data"])
+    expected = tb.cast(TABLE["data"], schema)
+    assert tb.cast(TABLE["data"], schema, engine="auto") == expected
+    with pytest.raises(ImportError):
+        tb.cast(TABLE["data"], schema, engine="numpy")
+    with pytest.raises(ValueError):
+        tb.cast(TABLE["data"], schema, engine="fortran")
+
+
+def test_cast_columns_layout():
+    rows = [
+        ["1", "1.5", "true", "2017-10-13", "1" + "0" * 30],
+        ["", "x", "FALSE", "", "2"],
+        ["-3", "2", "", "2017-10-14", "3"],
+    ]
+    data = {"header": list("ABCDE"), "rows": rows}
+    types = ["integer", "float", "boolean", "date", "integer"]
+    schema = [{"name": name, "type": type_}
+              for name, type_ in zip("ABCDE", types)]
+    expected = tb.cast(data, schema, report_formats=True)
+    for parallel in (False, "threads"):
+        res = tb.cast(data, schema, parallel=parallel, report_formats=True,
+                      layout="columns")
+        assert "rows" not in res and res["length"] == 3
+        a, b, c, d, e = res["columns"]
+        assert a["values"] == array("q", [1, 0, -3])
+        assert a["validity"] == bytes([0b101])
+        assert b["values"] == array("d", [1.5, 0.0, 0.0])
+        assert b["validity"] == bytes([0b001])
+        assert c["values"] == bytes([1, 0, 0])
+        assert c["validity"] == bytes([0b011])
+        assert isinstance(d["values"], list)
+        assert isinstance(e["values"], list)
+        assert tb.to_rows(res) == expected
+    with pytest.raises(ValueError):
+        tb.cast(data, schema, layout="diagonal")
+
+
+def test_cast_dictionary():
+    rows = [
+        ["open", "2017-10-13", str(i), "x" if i % 3 else ""]
+        for i in range(6)
+    ] + [["closed", "2017-10-14", "6", "y"], ["", "bad", "7", "y"]]
+    data = {"header": list("ABCD"), "rows": rows}
+    types = ["string", "date", "integer", "string"]
+    schema = [{"name": name, "type": type_}
+              for name, type_ in zip("ABCD", types)]
+    expected = tb.cast(data, schema, report_formats=True)
+    for parallel in (False, "threads"):
+        for dictionary in (True, "auto"):
+            assert tb.cast(data, schema, parallel=parallel,
+                           report_formats=True,
+                           dictionary=dictionary) == expected
+            res = tb.cast(data, schema, parallel=parallel,
+                          report_formats=True, layout="columns",
+                          dictionary=dictionary)
+            assert tb.to_rows(res) == expected
+            a, b, c, d = res["columns"]
+            assert a["dictionary"] == ["open", "closed", None]
+            assert a["codes"] == array("B", [0] * 6 + [1, 2])
+            assert a["validity"] == bytes([0b01111111])
+            assert b["dictionary"][2] is None
+            assert ("codes" in c) == (dictionary is True)
+            assert d["dictionary"] == [None, "x", "y"]
+    with pytest.raises(ValueError):
+        tb.cast(data, schema, dictionary="sometimes")
+    assert [ly.code_typecode(size) for size in (256, 257, 65537, 2 ** 33)] == [
+        "B", "H", "I", "Q"
+    ]
+    assert array(ly.code_typecode(65537)).itemsize == 4
+
+
+def test_cast_iter():
+    data = TABLE["data"]
+    schema = tb.infer_schema(data)
+    expected = tb.cast(data, schema, report_formats=True)
+    with ThreadPoolExecutor(2) as executor:
+        for parallel in (False, "threads", executor):
+            batches = list(tb.cast_iter(data, schema, batch_size=2,
+                                        parallel=parallel,
+                                        report_formats=True))
+            assert [row for batch in batches for row in batch["rows"]] == (
+                expected["rows"]
+            )
+            assert all(len(batch["rows"]) <= 2 for batch in batches)
+            assert batches[0]["formats"][0]["name"] == data["header"][0]
+    columns = list(tb.cast_iter(data, schema, batch_size=3,
+                                layout="columns", dictionary="auto"))
+    assert [row for batch in columns
+            for row in tb.to_rows(batch)["rows"]] == expected["rows"]
+
+    read = []
+
+    def rows():
+        for row in data["rows"] * 10:
+            read.append(row)
+            yield row
+
+    batches = tb.cast_iter({"header": data["header"], "rows": rows()},
+                           schema, batch_size=2, parallel="threads",
+                           max_in_flight=2)
+    next(batches)
+    assert len(read) <= 2 * 3
+    batches.close()
+    with pytest.raises(ValueError):
+        tb.cast_iter(data, schema, batch_size=0)
+    with pytest.raises(ValueError):
+        tb.cast_iter(data, schema, parallel="gpus")
+
+
+def test_ainfer_schema():
+    schema = tb.infer_schema(TABLE["data"])
+
+    async def infer():
+        entries = [entry async for entry in tb.ainfer_columns(TABLE["data"])]
+        rows = iter(TABLE["data"]["rows"])
+        with ThreadPoolExecutor(2) as executor:
+            from_iter = await tb.ainfer_schema(
+                {"header": TABLE["data"]["header"], "rows": rows},
+                executor=executor,
+            )
+        return entries, from_iter
+
+    assert asyncio.run(infer()) == (schema, schema)
+
+
+def test_acast_batches():
+    schema = tb.infer_schema(TABLE["data"])
+    expected = tb.cast(TABLE["data"], schema, report_formats=True)
+    semaphore = asyncio.Semaphore(1)
+
+    async def cast():
+        batches = []
+        async for batch in tb.acast_batches(
+            TABLE["data"], schema, batch_size=2, semaphore=semaphore
+        ):
+            assert semaphore.locked()
+            batches.append(batch["rows"])
+        assert not semaphore.locked()
+        result = await tb.acast(
+            TABLE["data"], schema, batch_size=2, report_formats=True
+        )
+        # Rows from a generator are read in the calling process.
+        with ProcessPoolExecutor(2) as executor:
+            from_iter = await tb.acast(
+                {"header": TABLE["data"]["header"],
+                 "rows": iter(TABLE["data"]["rows"])},
+                schema, batch_size=2, executor=executor,
+            )
+        return batches, result, from_iter
+
+    batches, result, from_iter = asyncio.run(cast())
+    assert all(len(batch) <= 2 for batch in batches)
+    assert sum(batches, []) == expected["rows"]
+    assert result == expected
+    assert from_iter["rows"] == expected["rows"]
+
+
+def test_acast_cancel():
+    rows = [["1"]] * 10000
+    schema = [{"name": "A", "type": "integer"}]
+    semaphore = asyncio.Semaphore(1)
+
+    async def cancel():
+        task = asyncio.create_task(tb.acast(
+            {"header": ["A"], "rows": rows}, schema, batch_size=10,
+            semaphore=semaphore,
+        ))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return semaphore.locked()
+
+    assert not asyncio.run(cancel())
+
+
+def test_instrumentation():
+    original = tp.TYPE_TO_TRY_CASTER["integer"]
+    events = []
+    with ins.recording([lambda event, data: events.append(event)]) as rec:
+        schema = tb.infer_schema(TABLE["data"], INFERRED_TYPES)
+        tb.cast(TABLE["data"], schema)
+        tb.infer_schema(TABLE["data"], INFERRED_TYPES, parallel="threads")
+        with pytest.raises(RuntimeError):
+            ins.enable()
+    assert ins.ACTIVE is None
+    assert tp.TYPE_TO_TRY_CASTER["integer"] is original
+    summary = rec.summary()
+    for counts in summary["types"].values():
+        assert counts["attempts"] == counts["successes"] + counts["failures"]
+    assert summary["types"]["integer"]["successes"] > 0
+    assert summary["types"]["time"]["failures"] > 0
+    assert [col["name"] for col in summary["sampled"][:7]] == (
+        TABLE["data"]["header"]
+    )
+    assert summary["pool"]["work"] > 0
+    assert summary["casts"][0]["rows"] == len(TABLE["data"]["rows"])
+    assert events == ["sample", "cast", "sample", "pool", "pool"]
+    assert "integer" in rec.report()
+    tb.infer_schema(TABLE["data"], INFERRED_TYPES)
+    assert rec.summary() == summary
+
+
 def test_table_error_empty_dict():
     with pytest.raises(exc.TableFormatError):
         tb.infer_schema({})